@@ -0,0 +1,36 @@
+"""Non-null defaults for photo tag and metadata columns
+
+Revision ID: 003_photo_list_defaults
+Revises: 002_firebase_uid_primary
+Create Date: 2026-10-16
+
+Backfills NULL user_tags / ai_tags / camera_data and makes the columns
+NOT NULL with empty-collection defaults, so response builders can read
+them without per-row `or []` / `or {}` coercion.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '003_photo_list_defaults'
+down_revision = '002_firebase_uid_primary'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Backfill NULLs, then set defaults and NOT NULL"""
+    op.execute("UPDATE photos SET user_tags = '{}'::text[] WHERE user_tags IS NULL")
+    op.execute("UPDATE photos SET ai_tags = '[]'::jsonb WHERE ai_tags IS NULL")
+    op.execute("UPDATE photos SET camera_data = '{}'::jsonb WHERE camera_data IS NULL")
+    
+    op.alter_column('photos', 'user_tags', server_default=sa.text("'{}'::text[]"), nullable=False)
+    op.alter_column('photos', 'ai_tags', server_default=sa.text("'[]'::jsonb"), nullable=False)
+    op.alter_column('photos', 'camera_data', server_default=sa.text("'{}'::jsonb"), nullable=False)
+
+
+def downgrade():
+    """Allow NULLs again (backfilled values are kept)"""
+    op.alter_column('photos', 'user_tags', server_default=None, nullable=True)
+    op.alter_column('photos', 'ai_tags', server_default=None, nullable=True)
+    op.alter_column('photos', 'camera_data', server_default=None, nullable=True)
@@ -0,0 +1,96 @@
+"""Trigger-maintained photo counters
+
+Revision ID: 004_photo_counts
+Revises: 003_photo_list_defaults
+Create Date: 2026-10-16
+
+The photo list endpoints need a total count for pagination. Running
+COUNT(*) over photos on every request gets expensive as the table grows, so
+this migration adds a photo_counts table kept up to date by a trigger on
+photos. Each user has one row. The all-users total is spread over 16 striped
+rows ('*0' .. '*15', picked by a hash of the user id) and read as their sum,
+so concurrent photo writes by different users don't all queue on one row lock.
+"""
+from alembic import op
+
+# revision identifiers
+revision = '004_photo_counts'
+down_revision = '003_photo_list_defaults'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create counters table, maintenance trigger and backfill"""
+    op.execute("""
+        CREATE TABLE photo_counts (
+            user_id VARCHAR(128) PRIMARY KEY,  -- photos.user_id, or an all-users stripe '*0'..'*15'
+            total BIGINT NOT NULL DEFAULT 0,
+            public_total BIGINT NOT NULL DEFAULT 0,
+            portfolio_total BIGINT NOT NULL DEFAULT 0,
+            public_portfolio_total BIGINT NOT NULL DEFAULT 0
+        )
+    """)
+    
+    # Add delta to the owner's row and to the owner's all-users stripe
+    op.execute("""
+        CREATE FUNCTION photo_counts_apply(p_user_id VARCHAR, p_public BOOLEAN, p_portfolio BOOLEAN, p_delta INTEGER)
+        RETURNS void AS $$
+        BEGIN
+            INSERT INTO photo_counts AS c (user_id, total, public_total, portfolio_total, public_portfolio_total)
+            SELECT k,
+                   p_delta,
+                   CASE WHEN p_public THEN p_delta ELSE 0 END,
+                   CASE WHEN p_portfolio THEN p_delta ELSE 0 END,
+                   CASE WHEN p_public AND p_portfolio THEN p_delta ELSE 0 END
+            FROM unnest(ARRAY[p_user_id, '*' || (hashtext(p_user_id) & 15)]) AS k
+            ON CONFLICT (user_id) DO UPDATE SET
+                total = c.total + EXCLUDED.total,
+                public_total = c.public_total + EXCLUDED.public_total,
+                portfolio_total = c.portfolio_total + EXCLUDED.portfolio_total,
+                public_portfolio_total = c.public_portfolio_total + EXCLUDED.public_portfolio_total;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    
+    op.execute("""
+        CREATE FUNCTION photo_counts_trigger() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM photo_counts_apply(OLD.user_id, COALESCE(OLD.is_public, false),
+                                           COALESCE(OLD.is_portfolio, false), -1);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM photo_counts_apply(NEW.user_id, COALESCE(NEW.is_public, false),
+                                           COALESCE(NEW.is_portfolio, false), 1);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    
+    op.execute("""
+        CREATE TRIGGER photos_maintain_counts
+        AFTER INSERT OR DELETE OR UPDATE OF user_id, is_public, is_portfolio ON photos
+        FOR EACH ROW EXECUTE FUNCTION photo_counts_trigger()
+    """)
+    
+    # Backfill from existing photos
+    op.execute("""
+        INSERT INTO photo_counts (user_id, total, public_total, portfolio_total, public_portfolio_total)
+        SELECT COALESCE(user_id, stripe),
+               COUNT(*),
+               COUNT(*) FILTER (WHERE is_public),
+               COUNT(*) FILTER (WHERE is_portfolio),
+               COUNT(*) FILTER (WHERE is_public AND is_portfolio)
+        FROM (SELECT p.*, '*' || (hashtext(p.user_id) & 15) AS stripe FROM photos p) p
+        GROUP BY GROUPING SETS ((user_id), (stripe))
+    """)
+
+
+def downgrade():
+    """Drop trigger, functions and counters table"""
+    op.execute("DROP TRIGGER IF EXISTS photos_maintain_counts ON photos")
+    op.execute("DROP FUNCTION IF EXISTS photo_counts_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS photo_counts_apply(VARCHAR, BOOLEAN, BOOLEAN, INTEGER)")
+    op.execute("DROP TABLE IF EXISTS photo_counts")
@@ -0,0 +1,51 @@
+"""Indexes for photo listing order
+
+Revision ID: 005_photo_listing_indexes
+Revises: 004_photo_counts
+Create Date: 2026-10-16
+
+The feed and gallery endpoints filter photos and order them by
+upload_date DESC. These indexes match those queries, so a page becomes
+an index scan of offset + limit rows instead of a sort over every match:
+- get_recent_photos: a partial index over public photos.
+- get_user_photos: (user_id, upload_date), plus a partial variant for
+  portfolio-only requests.
+
+The composite user index makes idx_photos_user_id redundant. Indexes are
+built CONCURRENTLY so photos stays writable during the migration.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '005_photo_listing_indexes'
+down_revision = '004_photo_counts'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create listing indexes and drop the superseded user_id index"""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_photos_public_upload_date', 'photos', [sa.text('upload_date DESC')],
+            postgresql_where=sa.text('is_public = true'), postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_photos_user_upload_date', 'photos', ['user_id', sa.text('upload_date DESC')],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_photos_user_portfolio_upload_date', 'photos', ['user_id', sa.text('upload_date DESC')],
+            postgresql_where=sa.text('is_portfolio = true'), postgresql_concurrently=True
+        )
+        op.drop_index('idx_photos_user_id', table_name='photos', postgresql_concurrently=True)
+
+
+def downgrade():
+    """Restore the plain user_id index and drop listing indexes"""
+    with op.get_context().autocommit_block():
+        op.create_index('idx_photos_user_id', 'photos', ['user_id'], postgresql_concurrently=True)
+        op.drop_index('idx_photos_user_portfolio_upload_date', table_name='photos', postgresql_concurrently=True)
+        op.drop_index('idx_photos_user_upload_date', table_name='photos', postgresql_concurrently=True)
+        op.drop_index('idx_photos_public_upload_date', table_name='photos', postgresql_concurrently=True)
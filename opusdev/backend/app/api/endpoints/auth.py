@@ -1,11 +1,13 @@
 """Authentication endpoints for Lumen API"""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
 
 from ...auth_middleware import get_current_user, get_optional_user, AuthUser
+from ...services.photo_service import issue_cdn_cookie, CDN_COOKIE_NAME, CDN_COOKIE_DOMAIN
+from ...utils import IDValidationError
 
 router = APIRouter()
 
@@ -63,6 +65,31 @@ async def get_profile(user_token: dict = Depends(get_current_user)):
         picture=user.picture
     )
 
+@router.get("/cdn-cookie")
+async def get_cdn_cookie(response: Response, user_token: dict = Depends(get_current_user)):
+    """
+    Issue the Cloud CDN signed cookie for the current user's own photos
+    Requires authentication - only used when PHOTO_CDN_BASE_URL is configured
+    """
+    user = AuthUser(user_token)
+    try:
+        cookie_value, max_age = issue_cdn_cookie(user.uid)
+    except IDValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    response.set_cookie(
+        CDN_COOKIE_NAME,
+        cookie_value,
+        max_age=max_age,
+        domain=CDN_COOKIE_DOMAIN,
+        secure=True,
+        httponly=True,
+        samesite="none"
+    )
+    return {"message": "CDN cookie issued", "expires_in": max_age}
+
 @router.post("/logout")
 async def logout():
     """
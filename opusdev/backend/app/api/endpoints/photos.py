@@ -10,21 +10,26 @@ from ...models.photo import (
     PhotoResponse, PhotoListResponse, CreatePhotoRequest, 
     UpdatePhotoRequest, PhotoSearchQuery
 )
-from ...services.photo_service import PhotoService
+from ...services.photo_service import PhotoService, MAX_UPLOAD_BYTES
 from ...services.location_service import LocationService
 from ...database.connection import get_db
 
 router = APIRouter()
 
+
+def get_photo_service(db: Session = Depends(get_db)) -> PhotoService:
+    """Dependency providing a PhotoService bound to the request's session"""
+    return PhotoService(db)
+
+
 @router.get("/recent", response_model=PhotoListResponse)
 async def get_recent_photos(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    photo_service: PhotoService = Depends(get_photo_service)
 ):
     """Get recent public photos - main feed endpoint"""
     try:
-        photo_service = PhotoService(db)
         return await photo_service.get_recent_photos(page=page, limit=limit)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get recent photos: {str(e)}")
@@ -33,11 +38,10 @@ async def get_recent_photos(
 async def list_photos(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    photo_service: PhotoService = Depends(get_photo_service)
 ):
     """List public photos with pagination - no authentication required"""
     try:
-        photo_service = PhotoService(db)
         return await photo_service.get_recent_photos(page=page, limit=limit)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get photos: {str(e)}")
@@ -60,7 +64,8 @@ async def upload_photo(
     is_public: bool = Form(True),
     is_portfolio: bool = Form(False),
     user_token: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    photo_service: PhotoService = Depends(get_photo_service)
 ):
     """Upload a photo file to Google Cloud Storage"""
     firebase_user = AuthUser(user_token)
@@ -68,11 +73,10 @@ async def upload_photo(
     # Validate file type
     if not file.content_type or not file.content_type.startswith('image/'):
         raise HTTPException(status_code=400, detail="File must be an image")
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"File must be at most {MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
     
     try:
-        # Read file content
-        file_content = await file.read()
-        
         # Parse tags
         tag_list = []
         if user_tags:
@@ -110,18 +114,20 @@ async def upload_photo(
         )
         
         # Upload photo
-        photo_service = PhotoService(db)
         photo = await photo_service.upload_photo(
             firebase_user=firebase_user,
-            file_content=file_content,
+            file_obj=file.file,  # Streamed from the spooled upload, not read into memory
             filename=file.filename or "upload.jpg",
             content_type=file.content_type,
-            request=request
+            request=request,
+            size=file.size
         )
         
         # Return photo response directly
         return photo
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
@@ -130,13 +136,12 @@ async def get_current_user_photos(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     user_token: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    photo_service: PhotoService = Depends(get_photo_service)
 ):
     """Get current user's photos - /user endpoint"""
     firebase_user = AuthUser(user_token)
     
     # Get PostgreSQL user UUID for this Firebase user
-    photo_service = PhotoService(db)
     try:
         user_id = await photo_service.ensure_user_exists(firebase_user)
         return await photo_service.get_user_photos(
@@ -154,13 +159,12 @@ async def get_my_photos(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     user_token: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    photo_service: PhotoService = Depends(get_photo_service)
 ):
     """Get current user's photos - optionally filtered to portfolio only"""
     firebase_user = AuthUser(user_token)
     
     try:
-        photo_service = PhotoService(db)
         return await photo_service.get_user_photos(
             user_id=firebase_user.uid,
             viewer_user_id=firebase_user.uid,
@@ -175,7 +179,7 @@ async def get_my_photos(
 async def get_photo(
     photo_id: str,
     user_token: dict = Depends(get_optional_user),
-    db: Session = Depends(get_db)
+    photo_service: PhotoService = Depends(get_photo_service)
 ):
     """Get a specific photo by ID"""
     viewer_user_id = None
@@ -184,7 +188,6 @@ async def get_photo(
         viewer_user_id = viewer_user.uid
     
     try:
-        photo_service = PhotoService(db)
         photo = await photo_service.get_photo_by_id(photo_id, viewer_user_id)
         if not photo:
             raise HTTPException(status_code=404, detail="Photo not found")
@@ -200,13 +203,12 @@ async def update_photo(
     photo_id: str,
     request: UpdatePhotoRequest,
     user_token: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    photo_service: PhotoService = Depends(get_photo_service)
 ):
     """Update photo metadata"""
     firebase_user = AuthUser(user_token)
     
     try:
-        photo_service = PhotoService(db)
         photo = await photo_service.update_photo(photo_id, firebase_user.uid, request)
         if not photo:
             raise HTTPException(status_code=404, detail="Photo not found or access denied")
@@ -221,13 +223,12 @@ async def update_photo(
 async def delete_photo(
     photo_id: str,
     user_token: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    photo_service: PhotoService = Depends(get_photo_service)
 ):
     """Delete a photo"""
     firebase_user = AuthUser(user_token)
     
     try:
-        photo_service = PhotoService(db)
         success = await photo_service.delete_photo(photo_id, firebase_user.uid)
         if not success:
             raise HTTPException(status_code=404, detail="Photo not found or access denied")
@@ -263,7 +264,7 @@ async def get_user_photos(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     user_token: dict = Depends(get_optional_user),
-    db: Session = Depends(get_db)
+    photo_service: PhotoService = Depends(get_photo_service)
 ):
     """Get photos for a specific user - optionally filtered to portfolio only"""
     viewer_user_id = None
@@ -272,7 +273,6 @@ async def get_user_photos(
         viewer_user_id = viewer_user.uid
     
     try:
-        photo_service = PhotoService(db)
         return await photo_service.get_user_photos(
             user_id=user_id,
             viewer_user_id=viewer_user_id,
@@ -36,6 +36,7 @@ engine = create_engine(
     "postgresql+pg8000://",
     creator=getconn,
     poolclass=NullPool,  # Disable SQLAlchemy connection pooling (Cloud SQL handles this)
+    query_cache_size=1200,  # Room for every hot-path statement variant in the compiled cache
     echo=os.getenv("DEBUG", "false").lower() == "true"  # Enable SQL logging in debug mode
 )
 
@@ -5,7 +5,7 @@ Supports collaborative tagging and flexible metadata
 
 from sqlalchemy import Column, String, Integer, Boolean, Text, DateTime, ForeignKey, ARRAY
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 import uuid
 from app.database.connection import Base
@@ -31,11 +31,12 @@ class Photo(Base):
     city_id = Column(Integer, ForeignKey("cities.id"))
     location_name = Column(String(200))  # Specific venue/studio name
     # Technical metadata (flexible for different cameras/equipment)
-    camera_data = Column(JSONB)  # {make, model, lens, settings: {iso, aperture, shutter, focal_length}}
+    camera_data = Column(JSONB, nullable=False, default=dict, server_default=text("'{}'::jsonb"))  # {make, model, lens, settings: {iso, aperture, shutter, focal_length}}
 
     # Content classification
-    ai_tags = Column(JSONB)  # Auto-generated tags from AI processing
-    user_tags = Column(ARRAY(Text))  # User-defined tags
+    # Never NULL (migration 003), so readers don't need `or []` guards
+    ai_tags = Column(JSONB, nullable=False, default=list, server_default=text("'[]'::jsonb"))  # Auto-generated tags from AI processing
+    user_tags = Column(ARRAY(Text), nullable=False, default=list, server_default=text("'{}'::text[]"))  # User-defined tags
     content_rating = Column(String(20), default='general')  # general, artistic_nude, mature
 
     # Collaboration and rights
@@ -92,12 +93,19 @@ class Photo(Base):
     @property
     def location_display(self):
         """Return location string for display"""
-        if self.location_name and self.city:
-            return f"{self.location_name}, {self.city.name}"
-        elif self.city:
-            return f"{self.city.name}, {self.city.country}"
-        elif self.location_name:
-            return self.location_name
+        if self.city:
+            return self.format_location(self.location_name, self.city.name, self.city.country)
+        return self.format_location(self.location_name)
+
+    @staticmethod
+    def format_location(location_name, city_name=None, city_country=None):
+        """Format a display location from a venue name and/or city columns"""
+        if location_name and city_name:
+            return f"{location_name}, {city_name}"
+        elif city_name:
+            return f"{city_name}, {city_country}"
+        elif location_name:
+            return location_name
         else:
             return "Unknown"
 
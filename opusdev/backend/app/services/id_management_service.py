@@ -31,6 +31,7 @@ from app.utils import (
     detect_id_type, is_valid_firebase_uid, is_valid_uuid, uuid_to_string
 )
 from app.database.connection import SessionLocal
+from app.services.storage_client import get_storage_client
 
 logger = logging.getLogger(__name__)
 
@@ -46,14 +47,22 @@ class IDManagementService:
     """
     
     def __init__(self, db: Session = None, storage_client: storage.Client = None):
+        # Only close sessions we opened; injected sessions belong to the caller
+        self._owns_db = db is None
         self.db = db if db else SessionLocal()
-        self.storage_client = storage_client if storage_client else storage.Client()
+        self.storage_client = storage_client if storage_client else get_storage_client()
         
-    def __del__(self):
-        """Cleanup database connection"""
-        if hasattr(self, 'db'):
+    def close(self):
+        """Close the database session if this service opened it"""
+        if self._owns_db:
             self.db.close()
     
+    def __enter__(self) -> "IDManagementService":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
     # Core ID Operations
     
     def normalize_user_id(self, user_id: Any, context: str = "") -> str:
@@ -209,9 +218,10 @@ class IDManagementService:
             raise ValueError(f"Invalid filename format in path: {storage_path}")
         
         # Validate extracted IDs
+        context = f"parsed from path: {storage_path}"
         try:
-            validate_firebase_uid(user_id, f"parsed from path: {storage_path}")
-            validate_uuid(photo_id_part, f"parsed from path: {storage_path}")
+            validate_firebase_uid(user_id, context)
+            validate_uuid(photo_id_part, context)
         except IDValidationError as e:
             raise ValueError(f"Invalid ID format in storage path {storage_path}: {e}")
         
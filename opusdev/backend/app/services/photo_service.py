@@ -2,26 +2,332 @@
 
 import os
 import uuid
+import base64
+import hashlib
+import hmac
+import asyncio
 import io
 import logging
-from typing import List, Optional, Any
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, List, Optional, Any, Tuple
+from datetime import timedelta
+from urllib.parse import urlsplit
 from PIL import Image
-from sqlalchemy import text
-from sqlalchemy.orm import Session, joinedload
-from google.cloud import storage
+from sqlalchemy import text, select, insert, func, lambda_stmt, bindparam
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from google.api_core.exceptions import NotFound
 
-from ..database.connection import SessionLocal
 from ..models.photo import Photo, PhotoResponse, CreatePhotoRequest, UpdatePhotoRequest, PhotoListResponse
 from ..models.user import User
+from ..models.lookup_tables import City
+from ..models.relationships import PhotoInteraction
 from ..auth_middleware import AuthUser
+from .storage_client import get_storage_client, get_bucket, get_signing_kwargs
+from ..utils import (
+    validate_firebase_uid, validate_uuid, validate_id_consistency,
+    fast_gcs_path, log_id_context
+)
 
 logger = logging.getLogger(__name__)
 
+# Create-if-missing for ensure_user_exists in a single round-trip, parsed once
+# at import. Falls back to :fallback_handle when :base_handle is already taken;
+# RETURNING yields a row only when a new user was inserted.
+_UPSERT_USER = text('''
+    WITH candidate AS (
+        SELECT CASE
+            WHEN EXISTS (SELECT 1 FROM users WHERE handle = :base_handle) THEN :fallback_handle
+            ELSE :base_handle
+        END AS handle
+    )
+    INSERT INTO users (
+        id, email, handle, display_name, 
+        city_id, primary_user_type, created_at, updated_at, last_active
+    )
+    SELECT
+        :id,
+        COALESCE(CAST(:email AS VARCHAR), candidate.handle || '@unknown.com'),
+        candidate.handle,
+        COALESCE(CAST(:display_name AS VARCHAR), candidate.handle),
+        4, 1, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+    FROM candidate
+    ON CONFLICT (id) DO NOTHING
+    RETURNING handle
+''')
+
+# Signed URL cache. URLs are signed for SIGNED_URL_EXPIRATION but only served
+# from cache for SIGNED_URL_CACHE_TTL seconds, so a cached URL always has a few
+# minutes of validity left when it reaches the client. Every entry has the same
+# TTL, so the dict's insertion order is also its expiry order: the oldest entry
+# is always first, and both expiry and size eviction pop from the front.
+SIGNED_URL_EXPIRATION = timedelta(hours=1)
+SIGNED_URL_CACHE_TTL = 55 * 60
+SIGNED_URL_CACHE_MAX_ENTRIES = int(os.getenv('SIGNED_URL_CACHE_MAX_ENTRIES', 10000))
+_signed_url_lock = threading.Lock()
+_signed_url_cache: Dict[Tuple[str, str], Tuple[float, str, str]] = {}
+
+
+def get_cached_photo_urls(photo_id: Any, firebase_uid: str) -> Optional[Tuple[str, str]]:
+    """Return cached (image_url, thumbnail_url) for a photo, or None if missing/expired"""
+    entry = _signed_url_cache.get((str(photo_id), firebase_uid))
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    return entry[1], entry[2]
+
+
+def cache_photo_urls(photo_id: Any, firebase_uid: str, image_url: str, thumbnail_url: str):
+    """Store freshly signed URLs for a photo"""
+    now = time.monotonic()
+    key = (str(photo_id), firebase_uid)
+    with _signed_url_lock:
+        # Re-insert rather than overwrite in place, to keep oldest-first order
+        _signed_url_cache.pop(key, None)
+        
+        # Drop expired entries, then the oldest live ones if still full
+        while _signed_url_cache:
+            oldest = next(iter(_signed_url_cache))
+            if _signed_url_cache[oldest][0] > now and len(_signed_url_cache) < SIGNED_URL_CACHE_MAX_ENTRIES:
+                break
+            del _signed_url_cache[oldest]
+        
+        _signed_url_cache[key] = (now + SIGNED_URL_CACHE_TTL, image_url, thumbnail_url)
+
+
+def invalidate_photo_urls(photo_id: Any, firebase_uid: str):
+    """Forget cached URLs for a photo (after update or delete)"""
+    with _signed_url_lock:
+        _signed_url_cache.pop((str(photo_id), firebase_uid), None)
+
+
+# List pages are fetched in batches from a server-side cursor, so memory stays
+# bounded whatever `limit` is and URL signing starts before the page is complete
+_STREAM_OPTIONS = {"yield_per": 50}
+
+# Totals for pagination come from photo_counts, which a trigger on photos keeps
+# current (see alembic 004_photo_counts), so listing never runs COUNT(*). The
+# all-users total is the sum of 16 striped rows, so photo writes by different
+# users don't serialize on a single counter row.
+ALL_USERS_COUNT_KEYS = tuple(f'*{stripe}' for stripe in range(16))
+_PHOTO_COUNT_QUERIES = {
+    column: text(
+        f"SELECT COALESCE(SUM({column}), 0) FROM photo_counts WHERE user_id IN :keys"
+    ).bindparams(bindparam("keys", expanding=True))
+    for column in ('total', 'public_total', 'portfolio_total', 'public_portfolio_total')
+}
+
+
+def _photo_rows(require_owner: bool = False):
+    """SELECT of the columns a PhotoResponse needs, for read-only endpoints
+    
+    Owner name, city and like count are joined/counted in the same statement,
+    and rows come back as plain tuples: no ORM instances to hydrate, and no
+    per-photo lazy loads of city or interactions. Called inside lambda_stmt,
+    so it is only built once per statement variant.
+    
+    Args:
+        require_owner: Inner-join the owner, leaving out photos whose user
+            row is missing (the public feed); otherwise the owner is optional
+    """
+    like_count = (
+        select(func.count(PhotoInteraction.id))
+        .where(PhotoInteraction.photo_id == Photo.id, PhotoInteraction.interaction_type == 'like')
+        .correlate(Photo)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(
+            Photo.id, Photo.user_id, Photo.title, Photo.description, Photo.location_name,
+            Photo.user_tags, Photo.ai_tags, Photo.is_public, Photo.is_portfolio,
+            Photo.upload_date, Photo.camera_data,
+            User.display_name.label('photographer_name'),
+            City.name.label('city_name'), City.country.label('city_country'),
+            like_count.label('like_count')
+        )
+        .select_from(Photo)
+    )
+    if require_owner:
+        stmt = stmt.join(User, User.id == Photo.user_id)
+    else:
+        stmt = stmt.outerjoin(User, User.id == Photo.user_id)
+    return stmt.outerjoin(City, City.id == Photo.city_id)
+
+
+def count_photos(db: Session, user_id: Optional[str] = None,
+                 public_only: bool = True, portfolio_only: bool = False) -> int:
+    """Read a maintained photo total for one user, or all users when user_id is None"""
+    column = ('public_' if public_only else '') + ('portfolio_total' if portfolio_only else 'total')
+    keys = ALL_USERS_COUNT_KEYS if user_id is None else (user_id,)
+    return int(db.execute(_PHOTO_COUNT_QUERIES[column], {"keys": list(keys)}).scalar() or 0)
+
+
+def sign_gcs_path(bucket_name: str, path: str, expiration: timedelta = SIGNED_URL_EXPIRATION) -> str:
+    """Generate a v4 GET signed URL for bucket_name/path
+    
+    Uses the cached bucket handle and the shared client's credentials, so
+    signing never repeats credential lookup or token refresh per URL.
+    """
+    return get_bucket(bucket_name).blob(path).generate_signed_url(
+        version="v4",
+        expiration=expiration,
+        method="GET",
+        **get_signing_kwargs()
+    )
+
+
+# List pages sign two URLs per uncached photo. Signing is CPU (RSA) or an IAM
+# signBlob round-trip depending on the credentials, so a page's photos are
+# signed concurrently rather than one after another.
+_signing_lock = threading.Lock()
+_signing_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_signing_pool() -> ThreadPoolExecutor:
+    """Return the thread pool used to sign list-page URLs"""
+    global _signing_pool
+    if _signing_pool is None:
+        with _signing_lock:
+            if _signing_pool is None:
+                workers = int(os.getenv('URL_SIGNING_WORKERS', 8))
+                _signing_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="url-signing")
+    return _signing_pool
+
+
+# Optional Cloud CDN delivery. When PHOTO_CDN_BASE_URL is set (a CDN backend
+# bucket in front of the photo bucket), a signed-in user gets a Cloud-CDN-Cookie
+# scoped to their own photos/{uid}/ originals, and those are served as plain CDN
+# URLs instead of with a v4 signature per URL. Every other photo URL - other
+# users' photos, public or not, and thumbnails - stays individually signed.
+# See issue_cdn_cookie and /api/v1/auth/cdn-cookie.
+PHOTO_CDN_BASE_URL = os.getenv('PHOTO_CDN_BASE_URL', '').rstrip('/')
+CDN_SIGNING_KEY_NAME = os.getenv('CDN_SIGNING_KEY_NAME', '')
+CDN_SIGNING_KEY = os.getenv('CDN_SIGNING_KEY', '')  # base64url-encoded, as created by gcloud
+CDN_COOKIE_NAME = "Cloud-CDN-Cookie"
+CDN_COOKIE_LIFETIME = timedelta(days=1)
+# Domain the cookie is set for: the CDN host by default. The API must be served
+# from that host or a subdomain of it (e.g. CDN_COOKIE_DOMAIN=example.com for
+# api.example.com + cdn.example.com), or browsers will drop the cookie.
+CDN_COOKIE_DOMAIN = os.getenv('CDN_COOKIE_DOMAIN') or urlsplit(PHOTO_CDN_BASE_URL).hostname
+
+
+def issue_cdn_cookie(firebase_uid: str, expiration: timedelta = CDN_COOKIE_LIFETIME) -> Tuple[str, int]:
+    """Build a Cloud CDN signed cookie value covering one user's own photos
+    
+    The policy's URLPrefix is {PHOTO_CDN_BASE_URL}/photos/{uid}/, so the cookie
+    grants nothing outside that user's originals.
+    
+    Returns:
+        Tuple of (cookie_value, max_age_seconds)
+        
+    Raises:
+        ValueError: If CDN delivery or its signing key is not configured
+        IDValidationError: If firebase_uid is not a valid Firebase UID
+    """
+    if not (PHOTO_CDN_BASE_URL and CDN_SIGNING_KEY_NAME and CDN_SIGNING_KEY):
+        raise ValueError("Cloud CDN delivery is not configured")
+    
+    validated_uid = validate_firebase_uid(firebase_uid, context="CDN cookie")
+    max_age = int(expiration.total_seconds())
+    url_prefix = base64.urlsafe_b64encode(f"{PHOTO_CDN_BASE_URL}/photos/{validated_uid}/".encode()).decode()
+    policy = f"URLPrefix={url_prefix}:Expires={int(time.time()) + max_age}:KeyName={CDN_SIGNING_KEY_NAME}"
+    digest = hmac.new(base64.urlsafe_b64decode(CDN_SIGNING_KEY), policy.encode(), hashlib.sha1).digest()
+    return f"{policy}:Signature={base64.urlsafe_b64encode(digest).decode()}", max_age
+
+
+# Upload limits. Oversized or unreadable files are rejected from the file size
+# and image header alone, before anything is stored or decoded. The pixel limit
+# is checked here rather than through Pillow's process-wide Image.MAX_IMAGE_PIXELS,
+# so other image handling in the process keeps Pillow's own defaults.
+MAX_UPLOAD_BYTES = int(os.getenv('MAX_UPLOAD_BYTES', 20 * 1024 * 1024))
+MAX_IMAGE_PIXELS = 50_000_000
+
+
+def check_image_upload(file_obj: BinaryIO, size: Optional[int] = None):
+    """Reject uploads that are too large or not a readable image
+    
+    Only the file size and the image header are read; no pixels are decoded.
+    
+    Raises:
+        ValueError: If the upload is over the size/pixel limits or not an image
+    """
+    if size is None:
+        size = file_obj.seek(0, os.SEEK_END)
+    if size > MAX_UPLOAD_BYTES:
+        raise ValueError(f"Image is larger than {MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
+    
+    file_obj.seek(0)
+    try:
+        with Image.open(file_obj) as image:
+            width, height = image.size
+    except (OSError, Image.DecompressionBombError) as e:
+        raise ValueError(f"Not a readable image: {e}")
+    finally:
+        file_obj.seek(0)
+    
+    if width * height > MAX_IMAGE_PIXELS:
+        raise ValueError(f"Image is {width}x{height}, over the {MAX_IMAGE_PIXELS // 1_000_000} MP limit")
+
+
+# Thumbnail generation is CPU-bound JPEG decode/resize/encode, so it runs off
+# the event loop. Pillow releases the GIL while decoding, resizing and encoding,
+# so worker threads read the upload's spooled file directly instead of the
+# whole image being copied into memory and pickled to a worker process.
+_thumbnail_lock = threading.Lock()
+_thumbnail_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_thumbnail_pool() -> ThreadPoolExecutor:
+    """Return the thread pool used for thumbnail generation"""
+    global _thumbnail_pool
+    if _thumbnail_pool is None:
+        with _thumbnail_lock:
+            if _thumbnail_pool is None:
+                workers = int(os.getenv('THUMBNAIL_WORKERS', os.cpu_count() or 1))
+                _thumbnail_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnails")
+    return _thumbnail_pool
+
+
+def create_thumbnail(file_obj: BinaryIO, max_size: tuple = (400, 400)) -> bytes:
+    """Create a JPEG thumbnail from an image file object"""
+    try:
+        file_obj.seek(0)
+        image = Image.open(file_obj)
+        
+        # Let libjpeg decode JPEGs at the smallest 1/2, 1/4 or 1/8 scale that
+        # still covers max_size (thumbnail() alone only drafts down to 2x it)
+        image.draft('RGB', max_size)
+        
+        # Palette and grey+alpha images are flattened through RGBA
+        if image.mode in ('LA', 'P'):
+            image = image.convert('RGBA')
+        
+        # Create thumbnail
+        image.thumbnail(max_size, Image.Resampling.LANCZOS)
+        
+        # Composite transparency onto white in one pass, at thumbnail size
+        # rather than full size
+        if image.mode == 'RGBA':
+            background = Image.new('RGBA', image.size, (255, 255, 255, 255))
+            image = Image.alpha_composite(background, image).convert('RGB')
+        
+        # Save to bytes
+        output = io.BytesIO()
+        image.save(output, format='JPEG', quality=85, optimize=True)
+        return output.getvalue()
+        
+    except Exception as e:
+        logger.warning(f"Failed to create thumbnail: {e}")
+        # Return original if thumbnail creation fails
+        file_obj.seek(0)
+        return file_obj.read()
+
 
 class PhotoService:
-    def __init__(self, db: Session = None):
-        self.storage_client = storage.Client()
+    def __init__(self, db: Session):
+        """Create a service bound to a caller-owned session (see get_db)"""
+        self.storage_client = get_storage_client()
         
         # CRITICAL WARNING: This bucket name MUST match actual GCS bucket!
         # Actual bucket: 'lumen-photos-20250731' 
@@ -29,15 +335,11 @@ class PhotoService:
         # See CLAUDE.md "CRITICAL SYSTEM DEPENDENCIES" section before changing!
         self.bucket_name = os.getenv('GOOGLE_CLOUD_STORAGE_BUCKET', 'lumen-photos-20250731')
         
-        self.bucket = self.storage_client.bucket(self.bucket_name)
-        self.db = db if db else SessionLocal()
-    
-    def __del__(self):
-        """Cleanup database connection"""
-        if hasattr(self, 'db'):
-            self.db.close()
+        self.bucket = get_bucket(self.bucket_name)
+        self.db = db
     
-    def _generate_photo_urls(self, photo_id: uuid.UUID, firebase_uid: str) -> tuple[str, str]:
+    def _generate_photo_urls(self, photo_id: uuid.UUID, firebase_uid: str,
+                             owner_view: bool = False) -> tuple[str, str]:
         """Generate signed URLs for photo and thumbnail dynamically
         
         This function constructs GCS file paths using validated ID formats.
@@ -48,6 +350,8 @@ class PhotoService:
         Args:
             photo_id: Photo UUID (will be converted to string)
             firebase_uid: Firebase UID string (will be validated)
+            owner_view: The viewer is the photo's owner, whose CDN cookie
+                covers the original
             
         Returns:
             Tuple of (image_url, thumbnail_url)
@@ -55,7 +359,10 @@ class PhotoService:
         Raises:
             IDValidationError: If ID formats are invalid
         """
-        from app.utils import validate_id_consistency, format_gcs_path, log_id_context
+        # Serve previously signed URLs while they are still fresh
+        cached = get_cached_photo_urls(photo_id, firebase_uid)
+        if cached:
+            return cached
         
         try:
             # Validate and convert IDs to consistent string format
@@ -64,10 +371,8 @@ class PhotoService:
             )
             
             # Construct file paths using validated, string-formatted IDs
-            image_path = format_gcs_path("photos", validated_user_id, f"{validated_photo_id}.jpg", 
-                                       context="image path")
-            thumb_path = format_gcs_path("thumbnails", validated_user_id, f"{validated_photo_id}_thumb.jpg",
-                                       context="thumbnail path")
+            image_path = fast_gcs_path("photos", validated_user_id, f"{validated_photo_id}.jpg")
+            thumb_path = fast_gcs_path("thumbnails", validated_user_id, f"{validated_photo_id}_thumb.jpg")
             
             # Log for debugging
             log_id_context("Generating signed URLs", 
@@ -76,24 +381,17 @@ class PhotoService:
                           image_path=image_path,
                           thumb_path=thumb_path)
             
-            # Generate signed URLs with 1-hour expiration (shorter for security)
-            from datetime import timedelta
-            
-            image_blob = self.bucket.blob(image_path)
-            thumb_blob = self.bucket.blob(thumb_path)
+            # Behind Cloud CDN the owner's cookie (scoped to photos/{uid}/)
+            # authorizes their own original - no per-URL signing. Not cached,
+            # since other viewers of the same photo need a signed URL.
+            if owner_view and PHOTO_CDN_BASE_URL:
+                return f"{PHOTO_CDN_BASE_URL}/{image_path}", sign_gcs_path(self.bucket_name, thumb_path)
             
-            image_url = image_blob.generate_signed_url(
-                version="v4",
-                expiration=timedelta(hours=1),
-                method="GET"
-            )
-            
-            thumbnail_url = thumb_blob.generate_signed_url(
-                version="v4", 
-                expiration=timedelta(hours=1),
-                method="GET"
-            )
+            # Generate signed URLs with 1-hour expiration (shorter for security)
+            image_url = sign_gcs_path(self.bucket_name, image_path)
+            thumbnail_url = sign_gcs_path(self.bucket_name, thumb_path)
             
+            cache_photo_urls(photo_id, firebase_uid, image_url, thumbnail_url)
             return image_url, thumbnail_url
             
         except Exception as e:
@@ -109,219 +407,219 @@ class PhotoService:
                 f"https://via.placeholder.com/200x200?text=Thumb+Error+{type(e).__name__}"
             )
     
-    async def ensure_user_exists(self, firebase_user: AuthUser) -> str:
-        """Ensure user exists in PostgreSQL, create if not"""
-        from app.utils import validate_firebase_uid, log_id_context
+    def _photo_row(self, photo_uuid: uuid.UUID):
+        """Photo, owner name, city and like count for one photo in one round trip"""
+        return self.db.execute(lambda_stmt(
+            lambda: _photo_rows().where(Photo.id == photo_uuid)
+        )).first()
+    
+    @staticmethod
+    def _row_to_response(row, image_url: str, thumbnail_url: str) -> PhotoResponse:
+        """Build a PhotoResponse from a _photo_rows() row
+        
+        Uses model_construct to skip Pydantic validation - every field already
+        comes from the database or from values we generated ourselves.
+        """
+        return PhotoResponse.model_construct(
+            id=str(row.id),
+            title=row.title,
+            description=row.description,
+            image_url=image_url,
+            thumbnail_url=thumbnail_url,
+            photographer_name=row.photographer_name or "Unknown",
+            location_display=Photo.format_location(row.location_name, row.city_name, row.city_country),
+            user_tags=row.user_tags,
+            ai_tags=row.ai_tags,
+            collaborators=[],
+            like_count=row.like_count,
+            is_liked=False,
+            is_portfolio=row.is_portfolio,
+            upload_date=row.upload_date,
+            camera_data=row.camera_data
+        )
+    
+    async def ensure_user_exists(self, firebase_user: AuthUser, commit: bool = True) -> str:
+        """Ensure user exists in PostgreSQL, create if not
         
+        Pass commit=False to leave the insert in the caller's transaction, so
+        it is committed together with whatever the caller writes next.
+        """
         # Validate Firebase UID format first
         validated_uid = validate_firebase_uid(firebase_user.uid, context="user existence check")
         
         log_id_context("Checking user existence", firebase_uid=validated_uid)
         
-        # Check if user already exists (Firebase UID is now the primary key)
-        result = self.db.execute(
-            text("SELECT id FROM users WHERE id = :firebase_uid"),
-            {"firebase_uid": validated_uid}
-        ).fetchone()
-        
-        if result:
-            logger.debug(f"User exists: {validated_uid}")
-            return validated_uid  # User exists, return Firebase UID
-        
-        # User doesn't exist - create minimal user record
-        logger.info(f"Creating new user record for Firebase UID: {validated_uid}")
-        
-        # Generate unique handle from email or name
+        # Generate handle from email or name; a short random suffix is used
+        # instead when the plain handle is already taken
         base_handle = firebase_user.email.split('@')[0] if firebase_user.email else 'user'
         base_handle = ''.join(c for c in base_handle if c.isalnum())[:20]  # Clean handle
         
-        # Find unique handle
-        handle = base_handle
-        counter = 1
-        while True:
-            existing = self.db.execute(
-                text("SELECT id FROM users WHERE handle = :handle"),
-                {"handle": handle}
-            ).fetchone()
-            if not existing:
-                break
-            handle = f"{base_handle}{counter}"
-            counter += 1
-        
-        # Create new user with Firebase UID as primary key
-        self.db.execute(text('''
-            INSERT INTO users (
-                id, email, handle, display_name, 
-                city_id, primary_user_type, created_at, updated_at, last_active
-            ) VALUES (
-                :id, :email, :handle, :display_name,
-                4, 1, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
-            )
-        '''), {
+        params = {
             "id": validated_uid,  # Validated Firebase UID as primary key
-            "email": firebase_user.email or f"{handle}@unknown.com",
-            "handle": handle,
-            "display_name": firebase_user.name or firebase_user.email or handle
-        })
+            "email": firebase_user.email,
+            "base_handle": base_handle,
+            "fallback_handle": f"{base_handle}_{uuid.uuid4().hex[:8]}",
+            "display_name": firebase_user.name or firebase_user.email
+        }
         
-        self.db.commit()
-        logger.info(f"Created user record: {validated_uid} (handle: {handle})")
+        try:
+            created = self.db.execute(_UPSERT_USER, params).fetchone()
+        except IntegrityError:
+            # Lost a race for the chosen handle - retry once with a fresh suffix
+            self.db.rollback()
+            params["base_handle"] = params["fallback_handle"]
+            params["fallback_handle"] = f"{base_handle}_{uuid.uuid4().hex[:8]}"
+            created = self.db.execute(_UPSERT_USER, params).fetchone()
+        
+        if commit:
+            self.db.commit()
+        
+        if created:
+            logger.info(f"Created user record: {validated_uid} (handle: {created[0]})")
+        else:
+            logger.debug(f"User exists: {validated_uid}")
         return validated_uid
     
+    @staticmethod
+    def _photo_paths(validated_firebase_uid: str, photo_id: uuid.UUID, filename: str) -> Tuple[str, str]:
+        """Build (original, thumbnail) storage paths for a new photo"""
+        file_extension = filename.split('.')[-1] if '.' in filename else 'jpg'
+        
+        # Generate storage paths using validated ID utilities
+        storage_filename = fast_gcs_path("photos", validated_firebase_uid, f"{photo_id}.{file_extension}")
+        thumbnail_filename = fast_gcs_path("thumbnails", validated_firebase_uid, f"{photo_id}_thumb.{file_extension}")
+        
+        log_id_context("Photo upload", 
+                      firebase_uid=validated_firebase_uid,
+                      photo_id=str(photo_id),
+                      storage_path=storage_filename,
+                      thumbnail_path=thumbnail_filename)
+        return storage_filename, thumbnail_filename
+    
+    @staticmethod
+    def _photo_values(photo_id: uuid.UUID, user_id: str, filename: str, request: CreatePhotoRequest) -> Dict[str, Any]:
+        """Column values for a new photo record"""
+        return dict(
+            id=photo_id,
+            user_id=user_id,  # This is the validated Firebase UID
+            title=request.title or filename,
+            description=request.description,
+            user_tags=request.user_tags or [],
+            is_collaborative=request.is_collaborative,
+            model_release_status=request.model_release_status,
+            content_rating=request.content_rating,
+            is_public=request.is_public,
+            is_portfolio=request.is_portfolio,
+            camera_data=request.camera_data or {},
+            city_id=request.city_id,
+            location_name=request.location_name
+        )
+    
+    async def _store_photo_files(self,
+                                 file_obj: BinaryIO,
+                                 content_type: str,
+                                 storage_filename: str,
+                                 thumbnail_filename: str,
+                                 size: Optional[int] = None):
+        """Upload the original and its thumbnail to GCS
+        
+        Both are read from file_obj (e.g. the UploadFile's spooled temp file),
+        so the original is never held in memory as a whole.
+        """
+        # The thumbnail is decoded from file_obj before the upload thread
+        # starts consuming it
+        thumbnail_content = await asyncio.get_running_loop().run_in_executor(
+            get_thumbnail_pool(), create_thumbnail, file_obj, (400, 400)
+        )
+        
+        # Upload the original (blocking HTTP, so in a worker thread) while the
+        # thumbnail is uploaded alongside it
+        blob = self.bucket.blob(storage_filename)
+        await asyncio.gather(
+            asyncio.to_thread(
+                blob.upload_from_file, file_obj, rewind=True, size=size, content_type=content_type
+            ),
+            self._upload_thumbnail(thumbnail_content, thumbnail_filename)
+        )
+        logger.info(f"Uploaded original image: {storage_filename}")
+    
     async def upload_photo(self, 
                           firebase_user: AuthUser, 
-                          file_content: bytes, 
+                          file_obj: BinaryIO, 
                           filename: str, 
                           content_type: str,
-                          request: CreatePhotoRequest) -> Photo:
-        """Upload a photo file to Google Cloud Storage and create database record"""
-        from app.utils import validate_firebase_uid, format_gcs_path, log_id_context
+                          request: CreatePhotoRequest,
+                          size: Optional[int] = None) -> PhotoResponse:
+        """Upload a photo file to Google Cloud Storage and create database record
         
+        The original is streamed to GCS straight from file_obj (e.g. the
+        UploadFile's spooled temp file) instead of being read into memory first.
+        """
         # Validate Firebase UID first
         validated_firebase_uid = validate_firebase_uid(firebase_user.uid, context="photo upload")
         
+        # Cheap size/header checks before any upload work
+        check_image_upload(file_obj, size)
+        
         # Generate unique photo ID
         photo_id = uuid.uuid4()
-        file_extension = filename.split('.')[-1] if '.' in filename else 'jpg'
-        
-        # Generate storage paths using validated ID utilities
-        storage_filename = format_gcs_path("photos", validated_firebase_uid, f"{photo_id}.{file_extension}",
-                                         context="photo upload")
-        thumbnail_filename = format_gcs_path("thumbnails", validated_firebase_uid, f"{photo_id}_thumb.{file_extension}",
-                                           context="thumbnail upload")
-        
-        log_id_context("Photo upload", 
-                      firebase_uid=validated_firebase_uid,
-                      photo_id=str(photo_id),
-                      storage_path=storage_filename,
-                      thumbnail_path=thumbnail_filename)
+        storage_filename, thumbnail_filename = self._photo_paths(validated_firebase_uid, photo_id, filename)
         
         try:
-            # Upload original image
-            blob = self.bucket.blob(storage_filename)
-            blob.upload_from_string(file_content, content_type=content_type)
-            logger.info(f"Uploaded original image: {storage_filename}")
-            
-            # Create and upload thumbnail
-            thumbnail_content = self._create_thumbnail(file_content)
-            thumbnail_blob = self.bucket.blob(thumbnail_filename)
-            thumbnail_blob.upload_from_string(thumbnail_content, content_type='image/jpeg')
-            logger.info(f"Uploaded thumbnail: {thumbnail_filename}")
-            
-            # Ensure user exists in PostgreSQL
-            user_id = await self.ensure_user_exists(firebase_user)
-            
-            # Create photo record using SQLAlchemy model
-            photo = Photo(
-                id=photo_id,
-                user_id=user_id,  # This is the validated Firebase UID
-                title=request.title or filename,
-                description=request.description,
-                user_tags=request.user_tags or [],
-                is_collaborative=request.is_collaborative,
-                model_release_status=request.model_release_status,
-                content_rating=request.content_rating,
-                is_public=request.is_public,
-                is_portfolio=request.is_portfolio,
-                camera_data=request.camera_data or {},
-                city_id=request.city_id,
-                location_name=request.location_name
-            )
+            await self._store_photo_files(file_obj, content_type, storage_filename, thumbnail_filename, size)
+            
+            # Ensure user exists in PostgreSQL (committed with the photo below)
+            user_id = await self.ensure_user_exists(firebase_user, commit=False)
             
-            self.db.add(photo)
+            # Create photo record and commit straight away: the insert trigger
+            # locks photo_counts rows, which must not stay held while URLs are signed
+            self.db.execute(insert(Photo).values(**self._photo_values(photo_id, user_id, filename, request)))
             self.db.commit()
-            self.db.refresh(photo)
-            logger.info(f"Created photo record: {photo.id}")
-            
-            # Generate dynamic URLs with validated IDs
-            image_url, thumbnail_url = self._generate_photo_urls(photo.id, validated_firebase_uid)
-            
-            # Return photo with generated URLs
-            return PhotoResponse(
-                id=str(photo.id),
-                title=photo.title,
-                description=photo.description,
-                image_url=image_url,
-                thumbnail_url=thumbnail_url,
-                photographer_name=firebase_user.name or firebase_user.email,
-                location_display=photo.location_display if hasattr(photo, 'location_display') else '',
-                user_tags=photo.user_tags or [],
-                ai_tags=photo.ai_tags or [],
-                collaborators=[],
-                like_count=0,
-                is_liked=False,
-                is_portfolio=photo.is_portfolio,
-                upload_date=photo.upload_date,
-                camera_data=photo.camera_data
-            )
+            logger.info(f"Created photo record: {photo_id}")
         except Exception as e:
             self.db.rollback()
             logger.error(f"Failed to upload photo: {str(e)}")
             raise Exception(f"Failed to upload photo: {str(e)}")
+        
+        # Outside the write transaction: read the new photo back with its
+        # server defaults, city and owner in one SELECT, then sign its URLs
+        row = self._photo_row(photo_id)
+        image_url, thumbnail_url = self._generate_photo_urls(photo_id, validated_firebase_uid, owner_view=True)
+        return self._row_to_response(row, image_url, thumbnail_url)
     
-    def _create_thumbnail(self, file_content: bytes, max_size: tuple = (400, 400)) -> bytes:
-        """Create a thumbnail from the uploaded image"""
-        try:
-            image = Image.open(io.BytesIO(file_content))
-            
-            # Convert RGBA to RGB if necessary
-            if image.mode in ('RGBA', 'LA', 'P'):
-                background = Image.new('RGB', image.size, (255, 255, 255))
-                if image.mode == 'P':
-                    image = image.convert('RGBA')
-                background.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
-                image = background
-            
-            # Create thumbnail
-            image.thumbnail(max_size, Image.Resampling.LANCZOS)
-            
-            # Save to bytes
-            output = io.BytesIO()
-            image.save(output, format='JPEG', quality=85, optimize=True)
-            return output.getvalue()
-            
-        except Exception as e:
-            logger.warning(f"Failed to create thumbnail: {e}")
-            # Return original if thumbnail creation fails
-            return file_content
+    async def _upload_thumbnail(self, thumbnail_content: bytes, thumbnail_filename: str):
+        """Upload a created thumbnail to GCS"""
+        thumbnail_blob = self.bucket.blob(thumbnail_filename)
+        await asyncio.to_thread(
+            thumbnail_blob.upload_from_string, thumbnail_content, content_type='image/jpeg'
+        )
+        logger.info(f"Uploaded thumbnail: {thumbnail_filename}")
     
     async def get_recent_photos(self, page: int = 1, limit: int = 20) -> PhotoListResponse:
         """Get recent photos from all users"""
         try:
             # Query recent photos with user information
+            # lambda_stmt caches the compiled SQL; offset/limit become bound params
             offset = (page - 1) * limit
-            photos = self.db.query(Photo).join(User).filter(
-                Photo.is_public == True
-            ).order_by(Photo.upload_date.desc()).offset(offset).limit(limit).all()
-            
-            # Get total count
-            total_count = self.db.query(Photo).filter(Photo.is_public == True).count()
-            
-            # Convert to response format
-            photo_responses = []
-            for photo in photos:
-                # Generate URLs dynamically with validated IDs
-                image_url, thumbnail_url = self._generate_photo_urls(photo.id, photo.user.id)
-                
-                photo_responses.append(PhotoResponse(
-                    id=str(photo.id),
-                    title=photo.title,
-                    description=photo.description,
-                    image_url=image_url,
-                    thumbnail_url=thumbnail_url,
-                    photographer_name=photo.user.display_name if photo.user else "Unknown",
-                    location_display=photo.location_display if hasattr(photo, 'location_display') else '',
-                    user_tags=photo.user_tags or [],
-                    ai_tags=photo.ai_tags or [],
-                    collaborators=[],
-                    like_count=photo.like_count if hasattr(photo, 'like_count') else 0,
-                    is_liked=False,
-                    is_portfolio=photo.is_portfolio,
-                    upload_date=photo.upload_date,
-                    camera_data=photo.camera_data
-                ))
-            
-            return PhotoListResponse(
+            stmt = lambda_stmt(lambda: _photo_rows(require_owner=True).where(Photo.is_public == True))
+            stmt += lambda s: s.order_by(Photo.upload_date.desc()).offset(offset).limit(limit)
+            
+            # Stream the page, handing each row's URL signing to the pool as it arrives
+            signing_pool = get_signing_pool()
+            rows = [
+                (row, signing_pool.submit(self._generate_photo_urls, row.id, row.user_id))
+                for row in self.db.execute(stmt, execution_options=_STREAM_OPTIONS)
+            ]
+            photo_responses = [self._row_to_response(row, *urls.result()) for row, urls in rows]
+            
+            # A short page ends the result set, so its total is known without
+            # a second query (unless it is empty past the end)
+            if len(rows) < limit and (rows or offset == 0):
+                total_count = offset + len(rows)
+            else:
+                total_count = count_photos(self.db)
+            
+            return PhotoListResponse.model_construct(
                 photos=photo_responses,
                 total_count=total_count,
                 page=page,
@@ -345,58 +643,41 @@ class PhotoService:
                              page: int = 1, 
                              limit: int = 20) -> PhotoListResponse:
         """Get photos for a specific user"""
-        from app.utils import validate_firebase_uid
-        
         try:
             # Validate user_id format
             validated_user_id = validate_firebase_uid(user_id, context="get user photos")
             
-            # Build query
-            query = self.db.query(Photo).filter(Photo.user_id == validated_user_id)            
+            # Build page query (lambda_stmt caches each variant's compiled SQL)
+            stmt = lambda_stmt(lambda: _photo_rows().where(Photo.user_id == validated_user_id))
             # Filter to portfolio photos if requested
             if portfolio_only:
-                query = query.filter(Photo.is_portfolio == True)
+                stmt += lambda s: s.where(Photo.is_portfolio == True)
             
             # Only show public photos unless viewing own photos
-            if viewer_user_id != validated_user_id:
-                query = query.filter(Photo.is_public == True)
+            public_only = viewer_user_id != validated_user_id
+            if public_only:
+                stmt += lambda s: s.where(Photo.is_public == True)
             
             # Paginate
             offset = (page - 1) * limit
-            photos = query.order_by(Photo.upload_date.desc()).offset(offset).limit(limit).all()
-            
-            # Get total count
-            total_count = query.count()
-            
-            # Get user info for photographer name
-            user = self.db.query(User).filter(User.id == validated_user_id).first()
-            photographer_name = user.display_name if user else "Unknown"
-            
-            # Convert to response format
-            photo_responses = []
-            for photo in photos:
-                # Generate URLs dynamically with validated IDs
-                image_url, thumbnail_url = self._generate_photo_urls(photo.id, validated_user_id)
-                
-                photo_responses.append(PhotoResponse(
-                    id=str(photo.id),
-                    title=photo.title,
-                    description=photo.description,
-                    image_url=image_url,
-                    thumbnail_url=thumbnail_url,
-                    photographer_name=photographer_name,
-                    location_display=photo.location_display if hasattr(photo, 'location_display') else '',
-                    user_tags=photo.user_tags or [],
-                    ai_tags=photo.ai_tags or [],
-                    collaborators=[],
-                    like_count=photo.like_count if hasattr(photo, 'like_count') else 0,
-                    is_liked=False,
-                    is_portfolio=photo.is_portfolio,
-                    upload_date=photo.upload_date,
-                    camera_data=photo.camera_data
-                ))
-            
-            return PhotoListResponse(
+            stmt += lambda s: s.order_by(Photo.upload_date.desc()).offset(offset).limit(limit)
+            
+            # Stream the page, handing each row's URL signing to the pool as it arrives
+            signing_pool = get_signing_pool()
+            rows = [
+                (row, signing_pool.submit(self._generate_photo_urls, row.id, validated_user_id, not public_only))
+                for row in self.db.execute(stmt, execution_options=_STREAM_OPTIONS)
+            ]
+            photo_responses = [self._row_to_response(row, *urls.result()) for row, urls in rows]
+            
+            # A short page ends the result set, so its total is known without
+            # a second query (unless it is empty past the end)
+            if len(rows) < limit and (rows or offset == 0):
+                total_count = offset + len(rows)
+            else:
+                total_count = count_photos(self.db, validated_user_id, public_only, portfolio_only)
+            
+            return PhotoListResponse.model_construct(
                 photos=photo_responses,
                 total_count=total_count,
                 page=page,
@@ -415,44 +696,25 @@ class PhotoService:
     
     async def get_photo_by_id(self, photo_id: str, viewer_user_id: Optional[str] = None) -> Optional[PhotoResponse]:
         """Get a single photo by ID"""
-        from app.utils import validate_uuid
-        
         try:
             # Validate photo_id format
             validated_photo_uuid = validate_uuid(photo_id, context="get photo by id")
             
-            photo = self.db.query(Photo).filter(Photo.id == validated_photo_uuid).first()
+            # Photo, owner name, city and like count in one round trip
+            row = self._photo_row(validated_photo_uuid)
             
-            if not photo:
+            if not row:
                 return None
             
             # Check access permissions
-            if not photo.is_public and photo.user_id != viewer_user_id:
+            if not row.is_public and row.user_id != viewer_user_id:
                 return None
             
-            # Get user info
-            user = self.db.query(User).filter(User.id == photo.user_id).first()
-            
             # Generate URLs dynamically with validated IDs
-            image_url, thumbnail_url = self._generate_photo_urls(photo.id, photo.user_id)
-            
-            return PhotoResponse(
-                id=str(photo.id),
-                title=photo.title,
-                description=photo.description,
-                image_url=image_url,
-                thumbnail_url=thumbnail_url,
-                photographer_name=user.display_name if user else "Unknown",
-                location_display=photo.location_display if hasattr(photo, 'location_display') else '',
-                user_tags=photo.user_tags or [],
-                ai_tags=photo.ai_tags or [],
-                collaborators=[],
-                like_count=photo.like_count if hasattr(photo, 'like_count') else 0,
-                is_liked=False,
-                is_portfolio=photo.is_portfolio,
-                upload_date=photo.upload_date,
-                camera_data=photo.camera_data
-            )
+            image_url, thumbnail_url = self._generate_photo_urls(row.id, row.user_id,
+                                                                 owner_view=row.user_id == viewer_user_id)
+            
+            return self._row_to_response(row, image_url, thumbnail_url)
         except Exception as e:
             logger.error(f"Error getting photo by ID: {e}")
             return None
@@ -462,8 +724,6 @@ class PhotoService:
                           user_id: str, 
                           request: UpdatePhotoRequest) -> Optional[PhotoResponse]:
         """Update photo metadata"""
-        from app.utils import validate_uuid, validate_firebase_uid
-        
         try:
             # Validate both IDs
             validated_photo_uuid = validate_uuid(photo_id, context="update photo")
@@ -495,23 +755,44 @@ class PhotoService:
             if request.content_rating is not None:
                 photo.content_rating = request.content_rating
             
-            photo.updated_at = datetime.utcnow()
-            
+            # updated_at is set by the database (onupdate=func.now())
             self.db.commit()
-            self.db.refresh(photo)
             
-            # Return updated photo
-            return await self.get_photo_by_id(str(photo.id), validated_user_id)
+            # Return updated photo read back in one SELECT (owner name, city and
+            # like count included) rather than a refresh plus lazy loads.
+            # Storage paths don't change on update, so previously signed URLs
+            # stay valid and come from the URL cache
+            row = self._photo_row(validated_photo_uuid)
+            image_url, thumbnail_url = self._generate_photo_urls(row.id, validated_user_id, owner_view=True)
+            return self._row_to_response(row, image_url, thumbnail_url)
             
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error updating photo: {e}")
             return None
     
+    def _delete_blob(self, path: str) -> bool:
+        """Delete a blob, returning False if it was already missing"""
+        try:
+            self.bucket.blob(path).delete()
+            return True
+        except NotFound:
+            return False
+    
+    def _start_blob_deletes(self, *paths: str) -> asyncio.Future:
+        """Start deleting blobs in worker threads right away
+        
+        The returned future resolves to one result per path: True/False from
+        _delete_blob, or the exception that delete raised.
+        """
+        loop = asyncio.get_running_loop()
+        return asyncio.gather(
+            *(loop.run_in_executor(None, self._delete_blob, path) for path in paths),
+            return_exceptions=True
+        )
+    
     async def delete_photo(self, photo_id: str, user_id: str) -> bool:
         """Delete a photo (both database record and files)"""
-        from app.utils import validate_uuid, validate_firebase_uid, format_gcs_path
-        
         try:
             # Validate both IDs
             validated_photo_uuid = validate_uuid(photo_id, context="delete photo")
@@ -525,33 +806,28 @@ class PhotoService:
             if not photo:
                 return False
             
-            # Delete files from storage using validated paths
-            try:
-                # Construct paths using validation utilities
-                validated_photo_id_str = str(validated_photo_uuid)
-                
-                # Delete original
-                image_path = format_gcs_path("photos", validated_user_id, f"{validated_photo_id_str}.jpg",
-                                           context="delete original")
-                blob = self.bucket.blob(image_path)
-                if blob.exists():
-                    blob.delete()
-                    logger.info(f"Deleted original image: {image_path}")
-                
-                # Delete thumbnail
-                thumb_path = format_gcs_path("thumbnails", validated_user_id, f"{validated_photo_id_str}_thumb.jpg",
-                                           context="delete thumbnail")
-                thumb_blob = self.bucket.blob(thumb_path)
-                if thumb_blob.exists():
-                    thumb_blob.delete()
-                    logger.info(f"Deleted thumbnail: {thumb_path}")
-                    
-            except Exception as e:
-                logger.warning(f"Failed to delete files from storage: {e}")
+            # Construct paths using validation utilities
+            validated_photo_id_str = str(validated_photo_uuid)
+            
+            image_path = fast_gcs_path("photos", validated_user_id, f"{validated_photo_id_str}.jpg")
+            thumb_path = fast_gcs_path("thumbnails", validated_user_id, f"{validated_photo_id_str}_thumb.jpg")
+            
+            # Original and thumbnail are deleted in worker threads (one request
+            # each, no exists() probe) while the database row is deleted here
+            files_deleted = self._start_blob_deletes(image_path, thumb_path)
+            
+            invalidate_photo_urls(photo.id, photo.user_id)
             
             # Delete database record
-            self.db.delete(photo)
-            self.db.commit()
+            try:
+                self.db.delete(photo)
+                self.db.commit()
+            finally:
+                for path, deleted in zip((image_path, thumb_path), await files_deleted):
+                    if isinstance(deleted, Exception):
+                        logger.warning(f"Failed to delete {path} from storage: {deleted}")
+                    elif deleted:
+                        logger.info(f"Deleted from storage: {path}")
             logger.info(f"Deleted photo record: {validated_photo_uuid}")
             
             return True
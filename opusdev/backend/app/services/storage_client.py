@@ -0,0 +1,86 @@
+"""Process-wide Google Cloud Storage client shared by the services"""
+
+import threading
+from typing import Any, Dict, Optional
+import google.auth
+import google.auth.credentials
+import google.auth.transport.requests
+from google.auth.transport.requests import AuthorizedSession
+from google.cloud import storage
+from requests.adapters import HTTPAdapter
+
+# Services are created per request (or per script run), so building a fresh
+# client each time would redo credential lookup and TLS setup on the
+# critical path. One client and one handle per bucket serve the process.
+_storage_lock = threading.Lock()
+_storage_client: Optional[storage.Client] = None
+_credentials: Optional[google.auth.credentials.Credentials] = None
+_buckets: Dict[str, storage.Bucket] = {}
+
+
+def get_storage_client() -> storage.Client:
+    """Return the process-wide storage client, creating it on first use
+    
+    The client is given its own AuthorizedSession (the documented _http
+    argument of storage.Client) mounted with a larger pool of persistent
+    HTTPS connections to GCS.
+    """
+    global _storage_client, _credentials
+    if _storage_client is None:
+        with _storage_lock:
+            if _storage_client is None:
+                credentials, project = google.auth.default(scopes=storage.Client.SCOPE)
+                session = AuthorizedSession(credentials)
+                session.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=64))
+                _credentials = credentials
+                _storage_client = storage.Client(project=project, credentials=credentials, _http=session)
+    return _storage_client
+
+
+def get_credentials() -> google.auth.credentials.Credentials:
+    """Return the credentials the shared storage client was built with"""
+    get_storage_client()
+    return _credentials
+
+
+def get_bucket(bucket_name: str) -> storage.Bucket:
+    """Return a cached bucket handle for the shared storage client"""
+    bucket = _buckets.get(bucket_name)
+    if bucket is None:
+        with _storage_lock:
+            bucket = _buckets.get(bucket_name)
+            if bucket is None:
+                bucket = get_storage_client().bucket(bucket_name)
+                _buckets[bucket_name] = bucket
+    return bucket
+
+
+_signing_lock = threading.Lock()
+_auth_request: Optional[google.auth.transport.requests.Request] = None
+
+
+def get_signing_kwargs() -> Dict[str, Any]:
+    """Credential arguments for Blob.generate_signed_url
+    
+    Key-file credentials sign locally. Metadata-server credentials (Cloud Run,
+    GKE Workload Identity) have no private key, so signing goes through IAM
+    signBlob with the service account email and an access token. The token is
+    refreshed only when it has expired rather than per URL, through one
+    shared transport request.
+    """
+    global _auth_request
+    credentials = get_credentials()
+    if isinstance(credentials, google.auth.credentials.Signing):
+        return {"credentials": credentials}
+    
+    if not credentials.valid:
+        with _signing_lock:
+            if not credentials.valid:
+                if _auth_request is None:
+                    _auth_request = google.auth.transport.requests.Request()
+                credentials.refresh(_auth_request)
+    return {
+        "credentials": credentials,
+        "service_account_email": credentials.service_account_email,
+        "access_token": credentials.token,
+    }
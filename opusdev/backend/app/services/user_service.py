@@ -5,7 +5,6 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
-from google.cloud import storage
 
 from ..database.connection import SessionLocal
 from ..models.user import (
@@ -14,12 +13,13 @@ from ..models.user import (
     ProfileImageData, ProfileImageSource
 )
 from ..auth_middleware import AuthUser
+from .storage_client import get_storage_client
 
 
 class UserService:
     def __init__(self):
         self.bucket_name = os.getenv('GOOGLE_CLOUD_STORAGE_BUCKET', 'lumen-photo-app-20250731.appspot.com')
-        self.storage_client = storage.Client()
+        self.storage_client = get_storage_client()
     
     async def create_user_profile(self, firebase_user: AuthUser, request: CreateUserRequest) -> UserProfileFull:
         """Create a new user profile in PostgreSQL"""
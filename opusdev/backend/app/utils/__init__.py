@@ -21,6 +21,7 @@ from .id_validation import (
     validate_user_id,
     validate_photo_id,
     format_gcs_path,
+    fast_gcs_path,
     validate_id_consistency,
     
     # Logging utilities
@@ -42,6 +43,7 @@ __all__ = [
     'validate_user_id',
     'validate_photo_id', 
     'format_gcs_path',
+    'fast_gcs_path',
     'validate_id_consistency',
     'log_id_context',
     'IDValidationError',
@@ -19,6 +19,7 @@ Design Principles:
 import re
 import uuid
 import logging
+from functools import lru_cache
 from typing import Union, Optional, TypeVar, Type
 from enum import Enum
 
@@ -36,18 +37,46 @@ class IDType(Enum):
     UUID_OBJECT = "uuid_object"
     UNKNOWN = "unknown"
 
+# Members are singletons, so these are compared with `is` and set membership
+_UUID_TYPES = frozenset((IDType.UUID_STRING, IDType.UUID_OBJECT))
+
 class IDValidationError(Exception):
-    """Raised when ID validation fails"""
+    """
+    Raised when ID validation fails
+    
+    The full message is built in __str__, so callers that catch and move on
+    (the GCS audit, is-valid style checks) never pay for formatting it.
+    """
     def __init__(self, message: str, id_value: any, expected_type: IDType):
+        self.message = message
         self.id_value = id_value
         self.expected_type = expected_type
-        super().__init__(f"{message}. Got: '{id_value}' (type: {type(id_value).__name__}), expected: {expected_type.value}")
+        # Passing the raw parts keeps the exception picklable
+        super().__init__(message, id_value, expected_type)
+    
+    def __str__(self):
+        return f"{self.message}. Got: '{self.id_value}' (type: {type(self.id_value).__name__}), expected: {self.expected_type.value}"
 
-# Firebase UID validation (28-character alphanumeric strings)
-FIREBASE_UID_PATTERN = re.compile(r'^[a-zA-Z0-9]{28}$')
+# Firebase UID validation (28-character alphanumeric strings). Checked with
+# str.isascii()/isalnum() rather than a regex: both run as C scans.
+FIREBASE_UID_LENGTH = 28
 
-# UUID validation (standard UUID4 format)
-UUID_PATTERN = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$', re.IGNORECASE)
+# UUID validation (standard UUID4 format). Only strings of this length are
+# matched against the pattern. The pattern is lowercase-only; callers lower()
+# the rare uppercase input instead of making every match case-insensitive.
+UUID_STRING_LENGTH = 36
+UUID_PATTERN = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$')
+
+# The same handful of user and photo IDs are validated many times per request
+# (every photo on a page repeats its owner's UID), so string detection and
+# parsing are memoized. The parsers return None for invalid input so callers
+# can raise with their own context; the caches are bounded, so junk input
+# cannot grow them.
+ID_CACHE_SIZE = 8192
+
+def _is_firebase_uid_str(value: str) -> bool:
+    """Check a str is exactly 28 ASCII letters/digits"""
+    return len(value) == FIREBASE_UID_LENGTH and value.isascii() and value.isalnum()
 
 def detect_id_type(value: any) -> IDType:
     """
@@ -68,10 +97,18 @@ def detect_id_type(value: any) -> IDType:
     if not isinstance(value, str):
         return IDType.UNKNOWN
         
-    if FIREBASE_UID_PATTERN.match(value):
+    return _detect_id_type_str(value)
+
+@lru_cache(maxsize=ID_CACHE_SIZE)
+def _detect_id_type_str(value: str) -> IDType:
+    """Detect the IDType of a string identifier"""
+    # Firebase UIDs and UUID strings have fixed, different lengths, so at
+    # most one check runs per value
+    length = len(value)
+    if length == FIREBASE_UID_LENGTH and value.isascii() and value.isalnum():
         return IDType.FIREBASE_UID
         
-    if UUID_PATTERN.match(value):
+    if length == UUID_STRING_LENGTH and UUID_PATTERN.match(value if value.islower() else value.lower()):
         return IDType.UUID_STRING
         
     return IDType.UNKNOWN
@@ -86,7 +123,7 @@ def is_valid_firebase_uid(value: any) -> bool:
     Returns:
         True if valid Firebase UID, False otherwise
     """
-    return detect_id_type(value) == IDType.FIREBASE_UID
+    return detect_id_type(value) is IDType.FIREBASE_UID
 
 def is_valid_uuid(value: any) -> bool:
     """
@@ -98,8 +135,22 @@ def is_valid_uuid(value: any) -> bool:
     Returns:
         True if valid UUID, False otherwise
     """
-    detected_type = detect_id_type(value)
-    return detected_type in [IDType.UUID_STRING, IDType.UUID_OBJECT]
+    return detect_id_type(value) in _UUID_TYPES
+
+@lru_cache(maxsize=ID_CACHE_SIZE)
+def _parse_firebase_uid(value: str) -> Optional[FirebaseUID]:
+    """Return value if it is a Firebase UID string, else None"""
+    return value if _is_firebase_uid_str(value) else None
+
+@lru_cache(maxsize=ID_CACHE_SIZE)
+def _parse_uuid_string(value: str) -> Optional[UUIDObject]:
+    """Return the UUID object for a UUID string, else None"""
+    if len(value) != UUID_STRING_LENGTH or not UUID_PATTERN.match(value if value.islower() else value.lower()):
+        return None
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        return None
 
 def validate_firebase_uid(value: any, context: str = "") -> FirebaseUID:
     """
@@ -115,15 +166,17 @@ def validate_firebase_uid(value: any, context: str = "") -> FirebaseUID:
     Raises:
         IDValidationError: If value is not a valid Firebase UID
     """
-    if not is_valid_firebase_uid(value):
+    validated = _parse_firebase_uid(value) if isinstance(value, str) else None
+    if validated is None:
         raise IDValidationError(
             f"Invalid Firebase UID{' in ' + context if context else ''}", 
             value, 
             IDType.FIREBASE_UID
         )
     
-    logger.debug(f"Validated Firebase UID{' in ' + context if context else ''}: {value}")
-    return str(value)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Validated Firebase UID{' in ' + context if context else ''}: {value}")
+    return validated
 
 def validate_uuid(value: any, context: str = "") -> UUIDObject:
     """
@@ -139,28 +192,22 @@ def validate_uuid(value: any, context: str = "") -> UUIDObject:
     Raises:
         IDValidationError: If value is not a valid UUID
     """
-    detected_type = detect_id_type(value)
-    
-    if detected_type == IDType.UUID_OBJECT:
-        logger.debug(f"Validated UUID object{' in ' + context if context else ''}: {value}")
+    if isinstance(value, uuid.UUID):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Validated UUID object{' in ' + context if context else ''}: {value}")
         return value
-    elif detected_type == IDType.UUID_STRING:
-        try:
-            uuid_obj = uuid.UUID(value)
-            logger.debug(f"Converted UUID string to object{' in ' + context if context else ''}: {value}")
-            return uuid_obj
-        except ValueError as e:
-            raise IDValidationError(
-                f"Invalid UUID string{' in ' + context if context else ''}: {e}", 
-                value, 
-                IDType.UUID_OBJECT
-            )
-    else:
+    
+    uuid_obj = _parse_uuid_string(value) if isinstance(value, str) else None
+    if uuid_obj is None:
         raise IDValidationError(
             f"Invalid UUID{' in ' + context if context else ''}", 
             value, 
             IDType.UUID_OBJECT
         )
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Converted UUID string to object{' in ' + context if context else ''}: {value}")
+    return uuid_obj
 
 def uuid_to_string(value: Union[UUIDObject, UUIDString], context: str = "") -> UUIDString:
     """
@@ -176,15 +223,15 @@ def uuid_to_string(value: Union[UUIDObject, UUIDString], context: str = "") -> U
     Raises:
         IDValidationError: If value is not a valid UUID
     """
-    detected_type = detect_id_type(value)
-    
-    if detected_type == IDType.UUID_STRING:
-        logger.debug(f"UUID already string{' in ' + context if context else ''}: {value}")
-        return str(value)
-    elif detected_type == IDType.UUID_OBJECT:
+    if isinstance(value, uuid.UUID):
         result = str(value)
-        logger.debug(f"Converted UUID object to string{' in ' + context if context else ''}: {result}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Converted UUID object to string{' in ' + context if context else ''}: {result}")
         return result
+    elif isinstance(value, str) and _detect_id_type_str(value) is IDType.UUID_STRING:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"UUID already string{' in ' + context if context else ''}: {value}")
+        return str(value)
     else:
         raise IDValidationError(
             f"Cannot convert to UUID string{' in ' + context if context else ''}", 
@@ -206,34 +253,36 @@ def ensure_string_format(*values, context: str = "") -> tuple:
     Raises:
         IDValidationError: If any value cannot be safely converted
     """
-    results = []
+    return tuple([_string_part(value, i, context) for i, value in enumerate(values)])
+
+def _string_part(value: any, position: int, context: str) -> str:
+    """Convert one ensure_string_format value, warning or raising as it does"""
+    if isinstance(value, str):
+        if _detect_id_type_str(value) is IDType.UNKNOWN:
+            # Allow other string values but log for monitoring
+            logger.warning(f"Converting non-ID value to string at position {position}{' in ' + context if context else ''}: {value} (type: {type(value).__name__})")
+        return str(value)
     
-    for i, value in enumerate(values):
-        if value is None:
-            raise IDValidationError(
-                f"None value at position {i}{' in ' + context if context else ''}", 
-                value, 
-                IDType.UNKNOWN
-            )
-        
-        detected_type = detect_id_type(value)
-        
-        if detected_type == IDType.FIREBASE_UID:
-            results.append(str(value))
-        elif detected_type in [IDType.UUID_STRING, IDType.UUID_OBJECT]:
-            results.append(str(value))
-        elif isinstance(value, (str, int)):
-            # Allow other string/numeric types but log for monitoring
-            logger.warning(f"Converting non-ID value to string at position {i}{' in ' + context if context else ''}: {value} (type: {type(value).__name__})")
-            results.append(str(value))
-        else:
-            raise IDValidationError(
-                f"Cannot convert value at position {i} to string{' in ' + context if context else ''}", 
-                value, 
-                IDType.UNKNOWN
-            )
+    if isinstance(value, uuid.UUID):
+        return str(value)
     
-    return tuple(results)
+    if value is None:
+        raise IDValidationError(
+            f"None value at position {position}{' in ' + context if context else ''}", 
+            value, 
+            IDType.UNKNOWN
+        )
+    
+    if isinstance(value, int):
+        # Allow numeric values but log for monitoring
+        logger.warning(f"Converting non-ID value to string at position {position}{' in ' + context if context else ''}: {value} (type: {type(value).__name__})")
+        return str(value)
+    
+    raise IDValidationError(
+        f"Cannot convert value at position {position} to string{' in ' + context if context else ''}", 
+        value, 
+        IDType.UNKNOWN
+    )
 
 def log_id_context(operation: str, **kwargs):
     """
@@ -243,6 +292,9 @@ def log_id_context(operation: str, **kwargs):
         operation: Description of the operation being performed
         **kwargs: Named ID values to log
     """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    
     id_info = []
     for name, value in kwargs.items():
         detected_type = detect_id_type(value)
@@ -274,12 +326,29 @@ def format_gcs_path(*path_parts, context: str = "GCS path construction") -> str:
     Raises:
         IDValidationError: If any path component is invalid
     """
-    safe_parts = ensure_string_format(*path_parts, context=context)
-    path = "/".join(safe_parts)
+    if len(path_parts) == 3:
+        # Every caller builds {prefix}/{uid}/{filename}; convert the parts
+        # directly instead of going through ensure_string_format's tuple
+        prefix, user_part, filename = path_parts
+        path = (f"{_string_part(prefix, 0, context)}/{_string_part(user_part, 1, context)}/"
+                f"{_string_part(filename, 2, context)}")
+    else:
+        path = "/".join(ensure_string_format(*path_parts, context=context))
     
-    logger.debug(f"Constructed GCS path{' for ' + context if context else ''}: {path}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Constructed GCS path{' for ' + context if context else ''}: {path}")
     return path
 
+def fast_gcs_path(prefix: str, user_id: FirebaseUID, name: str) -> str:
+    """
+    Build a "{prefix}/{user_id}/{name}" GCS path from already-validated parts
+    
+    For hot paths that have validated their IDs (e.g. via
+    validate_id_consistency); skips format_gcs_path's per-part checks and
+    logging. Use format_gcs_path for anything not yet validated.
+    """
+    return f"{prefix}/{user_id}/{name}"
+
 def validate_id_consistency(user_id: any, photo_id: any, context: str = "") -> tuple[FirebaseUID, UUIDString]:
     """
     Validate user_id and photo_id consistency for operations
@@ -295,11 +364,15 @@ def validate_id_consistency(user_id: any, photo_id: any, context: str = "") -> t
     Raises:
         IDValidationError: If either ID is invalid
     """
-    validated_user_id = validate_firebase_uid(user_id, f"user_id{' in ' + context if context else ''}")
-    validated_photo_uuid = validate_uuid(photo_id, f"photo_id{' in ' + context if context else ''}")
-    validated_photo_id = uuid_to_string(validated_photo_uuid, f"photo_id conversion{' in ' + context if context else ''}")
+    # Built once; both validators need it for their error messages
+    in_context = f" in {context}" if context else ""
+    validated_user_id = validate_firebase_uid(user_id, f"user_id{in_context}")
+    validated_photo_uuid = validate_uuid(photo_id, f"photo_id{in_context}")
+    # validate_uuid always returns a UUID object, so no re-detection is needed
+    validated_photo_id = str(validated_photo_uuid)
     
-    log_id_context(f"ID consistency validation{' for ' + context if context else ''}", 
-                   user_id=validated_user_id, photo_id=validated_photo_id)
+    if logger.isEnabledFor(logging.DEBUG):
+        log_id_context(f"ID consistency validation{' for ' + context if context else ''}", 
+                       user_id=validated_user_id, photo_id=validated_photo_id)
     
     return validated_user_id, validated_photo_id
\ No newline at end of file
@@ -103,11 +103,11 @@ CREATE TABLE photos (
     location_name VARCHAR(200), -- Specific venue/studio name
     
     -- Technical metadata (flexible for different cameras/equipment)
-    camera_data JSONB, -- {make, model, lens, settings: {iso, aperture, shutter, focal_length}}
+    camera_data JSONB NOT NULL DEFAULT '{}', -- {make, model, lens, settings: {iso, aperture, shutter, focal_length}}
     
     -- Content classification
-    ai_tags JSONB, -- Auto-generated tags from AI processing
-    user_tags TEXT[], -- User-defined tags
+    ai_tags JSONB NOT NULL DEFAULT '[]', -- Auto-generated tags from AI processing
+    user_tags TEXT[] NOT NULL DEFAULT '{}', -- User-defined tags
     content_rating VARCHAR(20) DEFAULT 'general', -- general, artistic_nude, mature
     
     -- Collaboration and rights
@@ -172,7 +172,9 @@ CREATE TABLE user_connections (
 CREATE INDEX idx_users_city ON users(city_id);
 CREATE INDEX idx_users_type ON users(primary_user_type);
 CREATE INDEX idx_users_handle ON users(handle);
-CREATE INDEX idx_photos_user ON photos(user_id);
+CREATE INDEX idx_photos_user_upload_date ON photos(user_id, upload_date DESC);
+CREATE INDEX idx_photos_user_portfolio_upload_date ON photos(user_id, upload_date DESC) WHERE is_portfolio = true;
+CREATE INDEX idx_photos_public_upload_date ON photos(upload_date DESC) WHERE is_public = true;
 CREATE INDEX idx_photos_city ON photos(city_id);
 CREATE INDEX idx_photos_created ON photos(created_at DESC);
 CREATE INDEX idx_photos_public ON photos(is_public) WHERE is_public = true;
@@ -201,4 +203,47 @@ $$ language 'plpgsql';
 
 CREATE TRIGGER update_users_updated_at BEFORE UPDATE ON users FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_photos_updated_at BEFORE UPDATE ON photos FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
-CREATE TRIGGER update_connections_updated_at BEFORE UPDATE ON user_connections FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
\ No newline at end of file
+CREATE TRIGGER update_connections_updated_at BEFORE UPDATE ON user_connections FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Photo totals for pagination, maintained by trigger (one row per user, plus the
+-- all-users total striped over '*0'..'*15' by user hash so writers don't share one row)
+CREATE TABLE photo_counts (
+    user_id VARCHAR(128) PRIMARY KEY,
+    total BIGINT NOT NULL DEFAULT 0,
+    public_total BIGINT NOT NULL DEFAULT 0,
+    portfolio_total BIGINT NOT NULL DEFAULT 0,
+    public_portfolio_total BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION photo_counts_apply(p_user_id VARCHAR, p_public BOOLEAN, p_portfolio BOOLEAN, p_delta INTEGER)
+RETURNS void AS $$
+BEGIN
+    INSERT INTO photo_counts AS c (user_id, total, public_total, portfolio_total, public_portfolio_total)
+    SELECT k,
+           p_delta,
+           CASE WHEN p_public THEN p_delta ELSE 0 END,
+           CASE WHEN p_portfolio THEN p_delta ELSE 0 END,
+           CASE WHEN p_public AND p_portfolio THEN p_delta ELSE 0 END
+    FROM unnest(ARRAY[p_user_id, '*' || (hashtext(p_user_id) & 15)]) AS k
+    ON CONFLICT (user_id) DO UPDATE SET
+        total = c.total + EXCLUDED.total,
+        public_total = c.public_total + EXCLUDED.public_total,
+        portfolio_total = c.portfolio_total + EXCLUDED.portfolio_total,
+        public_portfolio_total = c.public_portfolio_total + EXCLUDED.public_portfolio_total;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION photo_counts_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM photo_counts_apply(OLD.user_id::text, COALESCE(OLD.is_public, false), COALESCE(OLD.is_portfolio, false), -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM photo_counts_apply(NEW.user_id::text, COALESCE(NEW.is_public, false), COALESCE(NEW.is_portfolio, false), 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER photos_maintain_counts AFTER INSERT OR DELETE OR UPDATE OF user_id, is_public, is_portfolio ON photos FOR EACH ROW EXECUTE FUNCTION photo_counts_trigger();
@@ -21,23 +21,26 @@ Examples:
     # Audit specific folder
     python scripts/audit_gcs_files.py --prefix thumbnails/ --limit 100
 
-    # Generate detailed report
+    # Generate detailed report (invalid paths go to gcs_audit_report.json.invalid.jsonl)
     python scripts/audit_gcs_files.py --report-file gcs_audit_report.json
 """
 
 import os
+import re
 import sys
 import json
 import argparse
 import logging
-from typing import Dict, List, Any, Optional
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
 # Add the parent directory to sys.path to import app modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from app.services.id_management_service import IDManagementService
-from app.utils import validate_firebase_uid, validate_uuid, IDValidationError
+from app.utils import is_valid_firebase_uid, validate_firebase_uid, validate_uuid, IDValidationError
 from google.cloud import storage
 
 # Setup logging
@@ -47,15 +50,148 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Blobs requested per list_blobs page (the API maximum)
+AUDIT_PAGE_SIZE = 1000
+
+# Partial response for listings: only the metadata the audit reads, plus the
+# page token the iterator needs to continue
+AUDIT_LIST_FIELDS = "items(name,size,timeCreated),nextPageToken"
+
+# Threads validating listed pages while the next page is fetched
+DEFAULT_AUDIT_WORKERS = 4
+
+# Allowed top-level folders and file extensions, built once for O(1) lookups
+_EXPECTED_TYPES = frozenset(("photos", "thumbnails"))
+_VALID_EXTENSIONS = frozenset(("jpg", "jpeg", "png", "gif", "webp"))
+
+# Invalid entries kept in memory for the summary when they are streamed to disk
+RECENT_INVALID_PATHS = 100
+
+# A canonical {photos|thumbnails}/{firebase_uid}/{uuid4}[_thumb].{ext} path.
+# Every name this matches would pass the full parse and validation, so pages
+# are screened with this one C-level match and only the names it rejects go
+# through _audit_single_file to find out what is wrong with them.
+_VALID_PATH_PATTERN = re.compile(
+    r'(?:photos|thumbnails)/[A-Za-z0-9]{28}/'
+    r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-4[0-9a-fA-F]{3}-[89abAB][0-9a-fA-F]{3}-[0-9a-fA-F]{12}'
+    r'(?:_thumb)?\.(?i:jpg|jpeg|png|gif|webp)\Z'
+)
+
+
+def _fast_uuid_check(value: str) -> bool:
+    """
+    Check value is a dashed UUID4 string without building a uuid.UUID
+    
+    The audit only needs a yes/no answer, so this checks the dash and
+    version/variant positions and lets bytes.fromhex() check the hex digits.
+    """
+    if len(value) != 36 or value[8] != '-' or value[13] != '-' or value[18] != '-' or value[23] != '-':
+        return False
+    if value[14] != '4' or value[19] not in '89abAB':
+        return False
+    try:
+        return len(bytes.fromhex(value.replace('-', ''))) == 16
+    except ValueError:
+        return False
+
+
+# _scan_photo_path results, and the error_code reported for each
+PATH_OK = 0
+PATH_BAD_FORMAT = 1
+PATH_BAD_TYPE = 2
+PATH_BAD_UID = 3
+PATH_BAD_UUID = 4
+PATH_BAD_EXTENSION = 5
+
+_PATH_ERROR_CODES = {
+    PATH_BAD_FORMAT: "invalid_path_format",
+    PATH_BAD_TYPE: "unexpected_path_type",
+    PATH_BAD_UID: "invalid_firebase_uid",
+    PATH_BAD_UUID: "invalid_photo_uuid",
+    PATH_BAD_EXTENSION: "unexpected_file_extension",
+}
+
+
+def _scan_photo_path(name: str) -> int:
+    """
+    Check a storage path in one pass; returns PATH_OK or the first problem
+    
+    Accepts the same paths as IDManagementService.parse_storage_path plus the
+    audit's folder and extension checks, without splitting the path into
+    lists or raising and catching exceptions.
+    """
+    path = name.strip('/')
+    first = path.find('/')
+    second = path.find('/', first + 1) if first != -1 else -1
+    if second == -1:
+        return PATH_BAD_FORMAT
+    
+    # Anything after a third slash is ignored, as parse_storage_path does
+    third = path.find('/', second + 1)
+    filename = path[second + 1:] if third == -1 else path[second + 1:third]
+    thumb = filename.rfind('_thumb.')
+    if thumb != -1:
+        photo_id, extension = filename[:thumb], filename[thumb + 7:]
+    else:
+        dot = filename.rfind('.')
+        if dot == -1:
+            return PATH_BAD_FORMAT
+        photo_id, extension = filename[:dot], filename[dot + 1:]
+    
+    if not is_valid_firebase_uid(path[first + 1:second]):
+        return PATH_BAD_UID
+    if not _fast_uuid_check(photo_id):
+        return PATH_BAD_UUID
+    if path[:first] not in _EXPECTED_TYPES:
+        return PATH_BAD_TYPE
+    if extension.lower() not in _VALID_EXTENSIONS:
+        return PATH_BAD_EXTENSION
+    return PATH_OK
+
+
+def _describe_path_error(name: str, code: int) -> str:
+    """
+    The detailed message for a path _scan_photo_path rejected with code
+    
+    Only called for invalid entries, so it can afford to split the path and
+    run the full validators: the message is the same ValueError text that
+    IDManagementService.parse_storage_path and the audit's own checks give.
+    """
+    parts = name.strip('/').split('/')
+    if code == PATH_BAD_FORMAT:
+        if len(parts) < 3:
+            return f"Invalid storage path format: {name}"
+        return f"Invalid filename format in path: {name}"
+    
+    filename = parts[2]
+    if '_thumb.' in filename:
+        photo_id, extension = filename.rsplit('_thumb.', 1)
+    else:
+        photo_id, extension = filename.rsplit('.', 1)
+    
+    if code in (PATH_BAD_UID, PATH_BAD_UUID):
+        context = f"parsed from path: {name}"
+        try:
+            validate_firebase_uid(parts[1], context)
+            validate_uuid(photo_id, context)
+        except IDValidationError as e:
+            return f"Invalid ID format in storage path {name}: {e}"
+        return f"Invalid ID format in storage path {name}"
+    if code == PATH_BAD_TYPE:
+        return f"Unexpected path type: {parts[0]}, expected one of {sorted(_EXPECTED_TYPES)}"
+    return f"Unexpected file extension: {extension}, expected one of {sorted(_VALID_EXTENSIONS)}"
+
 
 class GCSAuditor:
     """Audits GCS files for ID format compliance"""
     
-    def __init__(self, bucket_name: str, verbose: bool = False):
+    def __init__(self, bucket_name: str, verbose: bool = False, workers: int = DEFAULT_AUDIT_WORKERS,
+                 invalid_paths_file: Optional[str] = None):
         self.bucket_name = bucket_name
         self.verbose = verbose
+        self.workers = max(1, workers)
+        self.invalid_paths_file = invalid_paths_file
         self.storage_client = storage.Client()
-        self.id_service = IDManagementService(storage_client=self.storage_client)
         
         # Results tracking
         self.results = {
@@ -68,6 +204,18 @@ class GCSAuditor:
             "errors": [],
             "summary": {}
         }
+        # Running counts, copied into results by _generate_summary
+        self._total = self._valid = self._invalid = 0
+        self._error_categories: Dict[str, int] = {}
+        
+        # With invalid_paths_file set, every invalid entry is written there as
+        # one JSON line as soon as its page is recorded, and only the most
+        # recent ones stay in memory, so a badly broken bucket can't exhaust RAM.
+        # The file is only open while audit_files runs.
+        self._invalid_fh = None
+        if invalid_paths_file:
+            self.results["invalid_paths_file"] = invalid_paths_file
+            self.results["invalid_paths"] = deque(maxlen=RECENT_INVALID_PATHS)
     
     def audit_files(self, prefix: str = "photos/", limit: Optional[int] = None) -> Dict[str, Any]:
         """
@@ -85,96 +233,110 @@ class GCSAuditor:
             logger.info(f"Limiting audit to {limit} files")
         
         try:
-            bucket = self.storage_client.bucket(self.bucket_name)
-            
-            # Configure blob listing
-            list_kwargs = {"prefix": prefix}
-            if limit:
-                list_kwargs["max_results"] = limit
-            
-            blobs = bucket.list_blobs(**list_kwargs)
-            
-            for blob in blobs:
-                self._audit_single_file(blob)
+            # Opened here so the handle is closed however the audit ends
+            with (open(self.invalid_paths_file, 'w') if self.invalid_paths_file else nullcontext()) as invalid_fh:
+                self._invalid_fh = invalid_fh
+                bucket = self.storage_client.bucket(self.bucket_name)
+                
+                # Configure blob listing
+                list_kwargs = {"prefix": prefix, "page_size": AUDIT_PAGE_SIZE, "fields": AUDIT_LIST_FIELDS}
+                if limit:
+                    list_kwargs["max_results"] = limit
+                
+                blobs = bucket.list_blobs(**list_kwargs)
                 
-                # Progress logging for large audits
-                if self.results["total_files"] % 100 == 0 and self.results["total_files"] > 0:
-                    logger.info(f"Audited {self.results['total_files']} files...")
+                # Pages have to be listed in order (each request needs the previous
+                # page's token), so this thread keeps listing while workers validate
+                # the pages already fetched. Workers don't touch self.results; their
+                # findings are folded in here, in listing order.
+                with ThreadPoolExecutor(max_workers=self.workers,
+                                        thread_name_prefix="gcs-audit") as executor:
+                    pending = deque()
+                    try:
+                        for page in blobs.pages:
+                            pending.append(executor.submit(self._audit_page, list(page)))
+                            if len(pending) > self.workers:
+                                self._record_page(*pending.popleft().result())
+                    finally:
+                        while pending:
+                            self._record_page(*pending.popleft().result())
             
         except Exception as e:
             error_msg = f"Failed to audit GCS files: {str(e)}"
             logger.error(error_msg)
             self.results["errors"].append(error_msg)
+        finally:
+            self._invalid_fh = None
         
         self._generate_summary()
         return self.results
     
-    def _audit_single_file(self, blob):
-        """Audit a single file for ID format compliance"""
-        self.results["total_files"] += 1
-        file_path = blob.name
+    def _audit_page(self, blobs: List[Any]) -> Tuple[int, List[Dict[str, Any]]]:
+        """Audit one listed page; returns (files audited, invalid entries)"""
+        invalid_entries = []
+        is_valid_path = _VALID_PATH_PATTERN.match
+        for blob in blobs:
+            if is_valid_path(blob.name):
+                continue
+            invalid_entry = self._audit_single_file(blob)
+            if invalid_entry is not None:
+                invalid_entries.append(invalid_entry)
+        return len(blobs), invalid_entries
+    
+    def _record_page(self, audited: int, invalid_entries: List[Dict[str, Any]]):
+        """Fold one page's findings into the results"""
+        self._total += audited
+        self._invalid += len(invalid_entries)
+        self._valid += audited - len(invalid_entries)
+        self.results["invalid_paths"].extend(invalid_entries)
         
-        if self.verbose and self.results["total_files"] % 50 == 0:
-            logger.debug(f"Auditing: {file_path}")
+        for invalid_entry in invalid_entries:
+            error_type = invalid_entry["error_type"]
+            self._error_categories[error_type] = self._error_categories.get(error_type, 0) + 1
+            if self._invalid_fh is not None:
+                self._invalid_fh.write(json.dumps(invalid_entry, default=str) + "\n")
         
-        try:
-            # Skip directory markers (paths ending with /)
-            if file_path.endswith('/'):
-                self.results["valid_files"] += 1
-                return
-            
-            # Parse and validate the path using IDManagementService
-            parsed = self.id_service.parse_storage_path(file_path)
-            
-            # Additional validation
-            self._validate_parsed_path(parsed, file_path)
-            
-            self.results["valid_files"] += 1
-            
-        except (ValueError, IDValidationError) as e:
-            self.results["invalid_files"] += 1
-            invalid_entry = {
-                "path": file_path,
-                "error": str(e),
-                "error_type": type(e).__name__,
-                "size": blob.size if hasattr(blob, 'size') else None,
-                "created": blob.time_created.isoformat() if hasattr(blob, 'time_created') and blob.time_created else None
-            }
-            self.results["invalid_paths"].append(invalid_entry)
-            
-            if self.verbose:
-                logger.warning(f"Invalid file path: {file_path} - {e}")
+        if self.verbose:
+            for invalid_entry in invalid_entries:
+                logger.warning(f"Invalid file path: {invalid_entry['path']} - {invalid_entry['error']}")
+        
+        logger.info(f"Audited {self._total} files...")
     
-    def _validate_parsed_path(self, parsed: Dict[str, str], original_path: str):
-        """Additional validation of parsed path components"""
+    def _audit_single_file(self, blob) -> Optional[Dict[str, Any]]:
+        """
+        Audit a single file for ID format compliance
         
-        # Validate that the path type is expected
-        expected_types = ["photos", "thumbnails"]
-        if parsed["type"] not in expected_types:
-            raise ValueError(f"Unexpected path type: {parsed['type']}, expected one of {expected_types}")
+        Safe to call from worker threads: it only reads shared state.
         
-        # Validate Firebase UID format
-        try:
-            validate_firebase_uid(parsed["user_id"], f"in path {original_path}")
-        except IDValidationError as e:
-            raise ValueError(f"Invalid Firebase UID in path: {e}")
+        Returns:
+            None if the file is valid, otherwise its invalid_paths entry
+        """
+        file_path = blob.name
         
-        # Validate UUID format
-        try:
-            validate_uuid(parsed["photo_id"], f"in path {original_path}")
-        except IDValidationError as e:
-            raise ValueError(f"Invalid photo UUID in path: {e}")
+        # Skip directory markers (paths ending with /)
+        if file_path.endswith('/'):
+            return None
         
-        # Validate file extension
-        valid_extensions = ["jpg", "jpeg", "png", "gif", "webp"]
-        if parsed["file_extension"].lower() not in valid_extensions:
-            raise ValueError(f"Unexpected file extension: {parsed['file_extension']}, expected one of {valid_extensions}")
+        code = _scan_photo_path(file_path)
+        if code == PATH_OK:
+            return None
+        
+        # Only invalid blobs get here, so parsing timeCreated is cheap overall
+        time_created = blob.time_created
+        return {
+            "path": file_path,
+            "error": _describe_path_error(file_path, code),
+            "error_type": "ValueError",
+            "error_code": _PATH_ERROR_CODES[code],
+            "size": blob.size,
+            "created": time_created.isoformat() if time_created else None
+        }
     
     def _generate_summary(self):
         """Generate summary statistics for the audit"""
-        total = self.results["total_files"]
-        valid = self.results["valid_files"]
-        invalid = self.results["invalid_files"]
+        total = self.results["total_files"] = self._total
+        valid = self.results["valid_files"] = self._valid
+        invalid = self.results["invalid_files"] = self._invalid
         
         self.results["summary"] = {
             "total_files_audited": total,
@@ -184,13 +346,10 @@ class GCSAuditor:
             "error_rate": (invalid / total * 100) if total > 0 else 0
         }
         
-        # Categorize errors
-        error_categories = {}
-        for invalid_path in self.results["invalid_paths"]:
-            error_type = invalid_path["error_type"]
-            error_categories[error_type] = error_categories.get(error_type, 0) + 1
-        
-        self.results["summary"]["error_categories"] = error_categories
+        # Counted as pages were recorded, since invalid_paths may be truncated
+        self.results["summary"]["error_categories"] = dict(self._error_categories)
+        if isinstance(self.results["invalid_paths"], deque):
+            self.results["invalid_paths"] = list(self.results["invalid_paths"])
         
         logger.info(f"Audit complete: {valid}/{total} files valid ({self.results['summary']['compliance_rate']:.1f}%)")
         if invalid > 0:
@@ -229,6 +388,13 @@ Examples:
         help="Maximum number of files to audit (default: no limit)"
     )
     
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_AUDIT_WORKERS,
+        help=f"Threads validating listed pages (default: {DEFAULT_AUDIT_WORKERS})"
+    )
+    
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -237,7 +403,7 @@ Examples:
     
     parser.add_argument(
         "--report-file",
-        help="Save detailed audit report to JSON file"
+        help="Save detailed audit report to JSON file; invalid paths are streamed to <file>.invalid.jsonl"
     )
     
     parser.add_argument(
@@ -266,7 +432,10 @@ Examples:
         return 1
     
     # Run audit
-    auditor = GCSAuditor(args.bucket, verbose=args.verbose)
+    # Invalid entries stream next to the report instead of piling up in memory
+    invalid_paths_file = f"{args.report_file}.invalid.jsonl" if args.report_file else None
+    auditor = GCSAuditor(args.bucket, verbose=args.verbose, workers=args.workers,
+                         invalid_paths_file=invalid_paths_file)
     results = auditor.audit_files(prefix=args.prefix, limit=args.limit)
     
     # Display results
@@ -286,15 +455,18 @@ Examples:
             for error_type, count in results['summary']['error_categories'].items():
                 print(f"  {error_type}: {count}")
             
-            if args.verbose and len(results['invalid_paths']) <= 10:
+            invalid_count = results['summary']['invalid_files']
+            if args.verbose and invalid_count <= 10:
                 print(f"\nInvalid files:")
                 for invalid in results['invalid_paths']:
                     print(f"  {invalid['path']}: {invalid['error']}")
-            elif len(results['invalid_paths']) > 10:
-                print(f"\nFirst 5 invalid files:")
+            elif invalid_count > 10:
+                print(f"\nSample of invalid files:")
                 for invalid in results['invalid_paths'][:5]:
                     print(f"  {invalid['path']}: {invalid['error']}")
-                print(f"  ... and {len(results['invalid_paths']) - 5} more")
+                print(f"  ... and {invalid_count - 5} more")
+                if invalid_paths_file:
+                    print(f"  Full list: {invalid_paths_file}")
     
     # Save report if requested
     if args.report_file:
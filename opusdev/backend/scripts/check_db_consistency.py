@@ -23,6 +23,12 @@ Examples:
 
     # Check specific tables only
     python scripts/check_db_consistency.py --tables users,photos --verbose
+
+    # Quick check: sample 1% of each table, full scan only where it fails
+    python scripts/check_db_consistency.py --sample-percent 1
+
+    # Trust the schema's uuid types and UID CHECK constraints
+    python scripts/check_db_consistency.py --fast
 """
 
 import os
@@ -30,17 +36,25 @@ import sys
 import json
 import argparse
 import logging
-from typing import Dict, List, Any, Optional, Set
+import queue
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Any, Optional, Set, Tuple
 from datetime import datetime
+from functools import lru_cache, partial
 
 # Add the parent directory to sys.path to import app modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from app.services.id_management_service import IDManagementService
-from app.database.connection import SessionLocal
-from app.utils import validate_firebase_uid, validate_uuid, IDValidationError
+from app.utils import IDValidationError, IDType
+from app.utils.id_validation import FIREBASE_UID_LENGTH, UUID_PATTERN
 from sqlalchemy import text, inspect
 
+try:
+    import orjson
+except ImportError:  # optional: reports fall back to the stdlib encoder
+    orjson = None
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -48,14 +62,137 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# PostgreSQL regex equivalents of the app's ID checks. The table checks use
+# them to find invalid rows server-side, so only those rows reach Python.
+FIREBASE_UID_SQL_PATTERN = f"^[A-Za-z0-9]{{{FIREBASE_UID_LENGTH}}}$"
+UUID_SQL_PATTERN = UUID_PATTERN.pattern  # matched case-insensitively (!~*)
+
+# Failing rows are streamed from a server-side cursor in chunks of this size
+STREAM_BATCH_SIZE = 10_000
+# Invalid records kept per table for the report; counts always cover every row
+DEFAULT_MAX_INVALID_SAMPLES = 100
+# Table checks run concurrently, each worker on its own connection
+DEFAULT_CHECK_WORKERS = 4
+
+
+def _report_json(data: Any, indent: bool = True) -> bytes:
+    """Serialize report data as JSON (indented or one line), using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(data, indent=2, default=str).encode()
+    return json.dumps(data, separators=(",", ":"), default=str).encode()
+
+
+def _write_report(path: str, results: Dict[str, Any]):
+    """
+    Save the report as one JSON document, or as JSON Lines for a .jsonl path
+    
+    The JSONL layout writes a header line, one line per table result, one
+    for referential integrity and a final summary line, so each section is
+    serialized and written on its own and consumers can read it line by line.
+    """
+    with open(path, 'wb') as f:
+        if not path.endswith(".jsonl"):
+            f.write(_report_json(results))
+            return
+        
+        header = {key: results[key] for key in ("check_timestamp", "database_info", "tables_checked")}
+        f.write(_report_json(header, indent=False) + b"\n")
+        for table_name, table_result in results["table_results"].items():
+            f.write(_report_json({"table": table_name, **table_result}, indent=False) + b"\n")
+        f.write(_report_json({"referential_integrity": results["referential_integrity"]}, indent=False) + b"\n")
+        f.write(_report_json({"summary": results["summary"]}, indent=False) + b"\n")
+
+
+def _statement_timeout(value: str) -> str:
+    """argparse type for --statement-timeout: a number with an optional ms/s/min/h unit"""
+    if not re.fullmatch(r"\d+\s*(ms|s|min|h)?", value.strip()):
+        raise argparse.ArgumentTypeError(f"invalid timeout {value!r} (e.g. 30s, 5min, 1h)")
+    return value.strip()
+
+
+def _sample_percent(value: str) -> float:
+    """argparse type for --sample-percent: a percentage in (0, 100]"""
+    try:
+        percent = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid percentage {value!r}")
+    if not 0 < percent <= 100:
+        raise argparse.ArgumentTypeError(f"sample percent must be in (0, 100], got {value}")
+    return percent
+
+
+def _is_statement_timeout(error: Exception) -> bool:
+    """True when error is PostgreSQL cancelling a statement at statement_timeout"""
+    message = str(error)
+    return "statement timeout" in message or "57014" in message
+
+
+def _invalid_firebase_uid_sql(column: str, nullable: bool = False) -> str:
+    """SQL predicate that is true when column is not a Firebase UID"""
+    if nullable:
+        return f"({column} IS NOT NULL AND {column}::text !~ :fb_re)"
+    return f"({column} IS NULL OR {column}::text !~ :fb_re)"
+
+
+def _invalid_uuid_sql(column: str) -> str:
+    """SQL predicate that is true when column is not a UUID"""
+    return f"({column} IS NULL OR {column}::text !~* :uuid_re)"
+
+
+# Columns checked for references to missing photos / users
+PHOTO_REFERENCE_COLUMNS = [
+    ("photo_collaborators", "photo_id"),
+    ("photo_interactions", "photo_id")
+]
+USER_REFERENCE_COLUMNS = [
+    ("photo_collaborators", "user_id"),
+    ("photo_interactions", "user_id"),
+    ("user_specialties", "user_id"),
+    ("user_connections", "requester_id"),
+    ("user_connections", "target_id")
+]
+
+
+@lru_cache(maxsize=4096)
+def _invalid_id_error(value: Any, expected: IDType, context: str) -> str:
+    """
+    The message validate_firebase_uid / validate_uuid would raise for value
+    
+    Cached because one bad ID is usually repeated across many rows (e.g. every
+    photo or specialty of a user whose UID was stored wrongly).
+    """
+    kind = "Firebase UID" if expected is IDType.FIREBASE_UID else "UUID"
+    return str(IDValidationError(f"Invalid {kind} in {context}", value, expected))
+
 
 class DatabaseConsistencyChecker:
     """Checks database consistency for ID formats and referential integrity"""
     
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, max_invalid_samples: int = DEFAULT_MAX_INVALID_SAMPLES,
+                 workers: int = DEFAULT_CHECK_WORKERS, fast: bool = False,
+                 statement_timeout: Optional[str] = None):
         self.verbose = verbose
-        self.db = SessionLocal()
-        self.id_service = IDManagementService(db=self.db)
+        self.fast = fast
+        # Per-statement limit (PostgreSQL interval, e.g. "5min"); None for no limit
+        self.statement_timeout = statement_timeout
+        self.max_invalid_samples = max_invalid_samples
+        self.workers = workers
+        # A plain Connection: the checker only reads, so it skips Session bookkeeping.
+        # Not AUTOCOMMIT, because server-side cursors need an open transaction.
+        # Imported here: loading the connection module starts the Cloud SQL
+        # connector, which --help and argument errors shouldn't wait for
+        from app.database.connection import engine
+        self.conn = engine.connect()
+        # TABLESAMPLE SYSTEM percentage applied to scans during a sample pass
+        self._sample_percent: Optional[float] = None
+        # Exported snapshot a worker checker joins instead of taking its own
+        self._snapshot_id: Optional[str] = None
+        # With fast: (table, column) pairs typed uuid, and those with a
+        # validated Firebase UID CHECK constraint
+        self._uuid_columns: Set[Tuple[str, str]] = set()
+        self._uid_checked_columns: Set[Tuple[str, str]] = set()
         
         # Results tracking
         self.results = {
@@ -68,76 +205,379 @@ class DatabaseConsistencyChecker:
             "referential_integrity": {},
             "summary": {}
         }
-        
-        # Get database info
+    
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+    
+    def __enter__(self) -> "DatabaseConsistencyChecker":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _load_database_info(self):
+        """Record the engine and table names in the results"""
         try:
-            inspector = inspect(self.db.bind)
+            inspector = inspect(self.conn)
             self.results["database_info"] = {
-                "engine": str(self.db.bind.engine),
+                "engine": str(self.conn.engine),
                 "tables": inspector.get_table_names()
             }
         except Exception as e:
             logger.warning(f"Could not get database info: {e}")
+            self._begin_snapshot()
+    
+    def _load_enforced_columns(self):
+        """
+        Find ID columns whose format the schema guarantees (fast mode)
+        
+        A uuid-typed column cannot hold a malformed UUID, and a validated
+        CHECK constraint with the Firebase UID pattern rules out bad UIDs, so
+        scans of those columns only need to look for NULLs.
+        """
+        try:
+            uuid_columns = self.conn.execute(text("""
+                SELECT table_name, column_name FROM information_schema.columns
+                WHERE table_schema = current_schema() AND data_type = 'uuid'
+            """)).fetchall()
+            constraints = self.conn.execute(text("""
+                SELECT conrelid::regclass::text, pg_get_constraintdef(oid) FROM pg_constraint
+                WHERE contype = 'c' AND convalidated
+            """)).fetchall()
+        except Exception as e:
+            logger.warning(f"Could not read ID column constraints, validating every column: {e}")
+            self._begin_snapshot()
+            return
+        
+        self._uuid_columns = {(table, column) for table, column in uuid_columns}
+        uid_pattern = re.escape(f"'{FIREBASE_UID_SQL_PATTERN}'")
+        for table, definition in constraints:
+            for column in re.findall(rf"\b(\w+)\)?(?:::[\w ]+)? ~ {uid_pattern}", definition):
+                self._uid_checked_columns.add((table, column))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"uuid-typed columns: {sorted(self._uuid_columns)}; "
+                         f"UID CHECK columns: {sorted(self._uid_checked_columns)}")
+    
+    def _invalid_id_sql(self, table: str, column: str, expected: IDType, nullable: bool = False) -> str:
+        """SQL predicate that is true when column fails its ID format check"""
+        if (table, column) in self._uuid_columns:
+            if expected is IDType.UUID_OBJECT:
+                return "FALSE" if nullable else f"({column} IS NULL)"
+            # A uuid value is never a Firebase UID, so every row fails
+            return f"({column} IS NOT NULL)" if nullable else "TRUE"
+        if expected is IDType.FIREBASE_UID and (table, column) in self._uid_checked_columns:
+            return "FALSE" if nullable else f"({column} IS NULL)"
+        if expected is IDType.FIREBASE_UID:
+            return _invalid_firebase_uid_sql(column, nullable)
+        return _invalid_uuid_sql(column)
     
     def check_all_tables(self, 
                         user_limit: Optional[int] = None, 
                         photo_limit: Optional[int] = None,
-                        tables: Optional[Set[str]] = None) -> Dict[str, Any]:
+                        tables: Optional[Set[str]] = None,
+                        sample_percent: Optional[float] = None) -> Dict[str, Any]:
         """
         Check all relevant tables for ID format consistency
         
+        With sample_percent set, each table is first checked on a
+        TABLESAMPLE of that many percent of its pages. A clean sample is
+        reported as-is (checked_via "sample"); the full scan only runs for
+        tables where the sample found problems.
+        
+        Tables are checked concurrently on up to `workers` extra connections,
+        all sharing this run's snapshot.
+        
         Args:
             user_limit: Maximum users to check (None for no limit)
             photo_limit: Maximum photos to check (None for no limit) 
             tables: Set of table names to check (None for all)
+            sample_percent: Percentage of pages to sample first (None for full scans)
             
         Returns:
             Dict with comprehensive check results
         """
         logger.info("Starting comprehensive database consistency check")
+        self._begin_snapshot()
+        self._load_database_info()
+        if self.fast:
+            self._load_enforced_columns()
         
-        # Define tables to check and their limits
+        # Define tables to check and their limits (check methods by name, so
+        # worker checkers can run them on their own connections)
         table_checks = {
-            "users": {"limit": user_limit, "check_func": self._check_users_table},
-            "photos": {"limit": photo_limit, "check_func": self._check_photos_table},
-            "user_specialties": {"limit": None, "check_func": self._check_user_specialties_table},
-            "photo_collaborators": {"limit": None, "check_func": self._check_photo_collaborators_table},
-            "photo_interactions": {"limit": None, "check_func": self._check_photo_interactions_table},
-            "user_connections": {"limit": None, "check_func": self._check_user_connections_table}
+            "users": {"limit": user_limit, "check_func": "_check_users_table"},
+            "photos": {"limit": photo_limit, "check_func": "_check_photos_table"},
+            "user_specialties": {"limit": None, "check_func": "_check_user_specialties_table"},
+            "photo_collaborators": {"limit": None, "check_func": "_check_photo_collaborators_table"},
+            "photo_interactions": {"limit": None, "check_func": "_check_photo_interactions_table"},
+            "user_connections": {"limit": None, "check_func": "_check_user_connections_table"}
         }
         
         # Filter tables if specified
         if tables:
             table_checks = {name: config for name, config in table_checks.items() if name in tables}
         
-        # Run checks for each table
-        for table_name, config in table_checks.items():
+        # Run checks for each table, merging results in table order
+        if self.workers > 1 and len(table_checks) > 1:
+            table_runs = self._table_checks_in_parallel(table_checks, sample_percent)
+        else:
+            table_runs = self._table_checks_in_order(table_checks, sample_percent)
+        
+        for table_name, get_result in table_runs:
             try:
-                logger.info(f"Checking table: {table_name}")
-                result = config["check_func"](config["limit"])
+                result = get_result()
                 self.results["table_results"][table_name] = result
                 self.results["tables_checked"].append(table_name)
                 self.results["total_records_checked"] += result.get("total_checked", 0)
                 self.results["total_errors"] += result.get("total_errors", 0)
                 
             except Exception as e:
-                error_msg = f"Failed to check table {table_name}: {str(e)}"
-                logger.error(error_msg)
-                self.results["table_results"][table_name] = {
-                    "error": error_msg,
-                    "total_checked": 0,
-                    "total_errors": 1
-                }
-                self.results["total_errors"] += 1
+                result = {"total_checked": 0, "total_errors": 0}
+                self._record_check_failure(result, table_name, e)
+                self.results["table_results"][table_name] = result
+                self.results["total_errors"] += result["total_errors"]
         
         # Check referential integrity
         self._check_referential_integrity()
+        self.conn.rollback()
         
         # Generate summary
         self._generate_summary()
         
         return self.results
     
+    def _begin_snapshot(self):
+        """
+        Start a REPEATABLE READ READ ONLY transaction
+        
+        Every check in the transaction sees the same snapshot, so counts and
+        orphan lookups across tables agree with each other. Worker checkers
+        join the snapshot exported by the main connection.
+        """
+        self.conn.rollback()
+        self.conn.execute(text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY"))
+        if self._snapshot_id:
+            self.conn.execute(text(f"SET TRANSACTION SNAPSHOT '{self._snapshot_id}'"))
+        if self.statement_timeout:
+            self.conn.execute(text("SELECT set_config('statement_timeout', :timeout, true)"),
+                              {"timeout": self.statement_timeout})
+    
+    def _record_check_failure(self, result: Dict[str, Any], table_name: str, error: Exception):
+        """
+        Note a failed table check in its result
+        
+        A statement timeout means the table was not fully checked, not that
+        its data is bad, so it is marked timed_out rather than counted as an
+        error.
+        """
+        if _is_statement_timeout(error):
+            logger.error(f"Checking {table_name} timed out after {self.statement_timeout}")
+            result["error"] = f"timed out after {self.statement_timeout}"
+            result["timed_out"] = True
+            return
+        logger.error(f"Failed to check {table_name} table: {error}")
+        result["error"] = str(error)
+        result["total_errors"] += 1
+    
+    def _table_checks_in_order(self, table_checks: Dict[str, Dict[str, Any]],
+                               sample_percent: Optional[float]):
+        """Yield (table, result getter) for checks run one by one on this connection"""
+        for table_name, config in table_checks.items():
+            yield table_name, partial(
+                self._run_table_check, table_name, config["check_func"], config["limit"], sample_percent
+            )
+    
+    def _table_checks_in_parallel(self, table_checks: Dict[str, Dict[str, Any]],
+                                  sample_percent: Optional[float]):
+        """
+        Yield (table, result getter) for checks running on worker connections
+        
+        Each worker is a checker on its own connection that joins this
+        transaction's snapshot (pg_export_snapshot), so results stay as
+        consistent as a sequential run.
+        """
+        snapshot_id = self.conn.execute(text("SELECT pg_export_snapshot()")).scalar()
+        idle_workers = queue.SimpleQueue()
+        workers = []
+        try:
+            for _ in range(min(self.workers, len(table_checks))):
+                worker = DatabaseConsistencyChecker(self.verbose, self.max_invalid_samples, workers=1,
+                                                    fast=self.fast, statement_timeout=self.statement_timeout)
+                workers.append(worker)
+                worker._snapshot_id = snapshot_id
+                worker._uuid_columns = self._uuid_columns
+                worker._uid_checked_columns = self._uid_checked_columns
+                worker._begin_snapshot()
+                idle_workers.put(worker)
+            
+            def run(table_name: str, config: Dict[str, Any]) -> Dict[str, Any]:
+                worker = idle_workers.get()
+                try:
+                    return worker._run_table_check(table_name, config["check_func"], config["limit"], sample_percent)
+                finally:
+                    idle_workers.put(worker)
+            
+            with ThreadPoolExecutor(max_workers=len(workers)) as executor:
+                futures = [(name, executor.submit(run, name, config)) for name, config in table_checks.items()]
+                for table_name, future in futures:
+                    yield table_name, future.result
+        finally:
+            for worker in workers:
+                worker.close()
+    
+    def _run_table_check(self, table_name: str, check_name: str, limit: Optional[int],
+                         sample_percent: Optional[float]) -> Dict[str, Any]:
+        """Run one table's check, sampling first when sample_percent is set"""
+        logger.info(f"Checking table: {table_name}")
+        check_func = getattr(self, check_name)
+        try:
+            result = None
+            if sample_percent:
+                result = self._check_table_sample(check_func, limit, sample_percent)
+            if result is None:
+                result = check_func(limit)
+                result["checked_via"] = "full_scan"
+        except Exception:
+            # A failed statement aborts the transaction; start a fresh one
+            self._begin_snapshot()
+            raise
+        
+        if "error" in result:
+            self._begin_snapshot()
+        return result
+    
+    def _check_table_sample(self, check_func, limit: Optional[int],
+                            sample_percent: float) -> Optional[Dict[str, Any]]:
+        """Run check_func on a table sample; None when the sample found problems or failed"""
+        self._sample_percent = sample_percent
+        try:
+            result = check_func(limit)
+        finally:
+            self._sample_percent = None
+        
+        if result.get("total_errors", 0) or "error" in result:
+            logger.info(f"Sample of {result.get('table')} found problems, running full scan")
+            return None
+        result["checked_via"] = "sample"
+        result["sample_percent"] = sample_percent
+        return result
+    
+    def _scan_id_columns(self, table: str, columns: List[str], invalid_predicates: List[str],
+                         limit: Optional[int] = None,
+                         key: Optional[str] = None) -> Tuple[int, int, List[int], Iterable[Any]]:
+        """
+        Validate ID columns of a table server-side
+        
+        Each predicate gets one bit of an errmask computed per row. One
+        aggregate returns the row count, the number of rows failing any check
+        and the count failing each predicate. Only when something failed are
+        the failing rows (with their errmask last) fetched, at most
+        max_invalid_samples of them, through a server-side cursor in
+        STREAM_BATCH_SIZE chunks. During a sample pass the
+        table is read through TABLESAMPLE SYSTEM.
+        
+        A limited scan of a table with a unique key is paged through in key
+        order instead (see _scan_id_columns_keyset).
+        
+        Args:
+            table: Table to scan
+            columns: Columns returned for failing rows
+            invalid_predicates: SQL predicates, true when a check fails
+            limit: Maximum rows to check (None for no limit)
+            key: Unique column used to page limited scans
+            
+        Returns:
+            Tuple of (rows checked, invalid rows, failures per predicate, failing rows)
+        """
+        column_list = ", ".join(columns)
+        errmask = " + ".join(
+            f"(CASE WHEN {predicate} THEN {1 << bit} ELSE 0 END)"
+            for bit, predicate in enumerate(invalid_predicates)
+        )
+        failure_counts = ", ".join(
+            f"COUNT(*) FILTER (WHERE errmask & {1 << bit} <> 0)"
+            for bit in range(len(invalid_predicates))
+        )
+        params = {"fb_re": FIREBASE_UID_SQL_PATTERN, "uuid_re": UUID_SQL_PATTERN}
+        sample_clause = ""
+        if self._sample_percent:
+            sample_clause = " TABLESAMPLE SYSTEM (CAST(:sample_percent AS real)) REPEATABLE (0)"
+            params["sample_percent"] = self._sample_percent
+        source = f"{table}{sample_clause}"
+        
+        if limit and key:
+            return self._scan_id_columns_keyset(
+                source, key, column_list, errmask, failure_counts, len(invalid_predicates), params, limit
+            )
+        
+        limit_clause = ""
+        if limit:
+            limit_clause = " LIMIT :limit"
+            params["limit"] = limit
+        scanned = f"(SELECT {column_list}, {errmask} AS errmask FROM {source}{limit_clause}) t"
+        
+        counts = self.conn.execute(
+            text(f"SELECT COUNT(*), COUNT(*) FILTER (WHERE errmask <> 0), {failure_counts} FROM {scanned}"),
+            params
+        ).one()
+        total, invalid_rows, failures = counts[0], counts[1], list(counts[2:])
+        if not invalid_rows or self.max_invalid_samples <= 0:
+            return total, invalid_rows, failures, ()
+        
+        params["max_samples"] = self.max_invalid_samples
+        records = self.conn.execute(
+            text(f"SELECT * FROM {scanned} WHERE errmask <> 0 LIMIT :max_samples"), params,
+            execution_options={"stream_results": True, "yield_per": STREAM_BATCH_SIZE}
+        )
+        return total, invalid_rows, failures, records
+    
+    def _scan_id_columns_keyset(self, source: str, key: str, column_list: str, errmask: str,
+                                failure_counts: str, predicate_count: int,
+                                params: Dict[str, Any], limit: int) -> Tuple[int, int, List[int], List[Any]]:
+        """
+        Limited scan paged by key: WHERE key > :last_key ORDER BY key LIMIT batch
+        
+        Every batch is a short index range scan, progress is logged per batch,
+        and the rows checked are always the first `limit` by key, so the
+        counts and the failing rows come from the same rows.
+        """
+        total, invalid_rows = 0, 0
+        failures = [0] * predicate_count
+        records: List[Any] = []
+        last_key = None
+        while total < limit:
+            batch_size = min(STREAM_BATCH_SIZE, limit - total)
+            after_clause = ""
+            batch_params = dict(params, batch_size=batch_size)
+            if last_key is not None:
+                after_clause = f" WHERE {key} > :last_key"
+                batch_params["last_key"] = last_key
+            batch = (f"WITH batch AS (SELECT {key} AS batch_key, {column_list}, {errmask} AS errmask "
+                     f"FROM {source}{after_clause} ORDER BY {key} LIMIT :batch_size)")
+            
+            counts = self.conn.execute(text(
+                f"{batch} SELECT COUNT(*), COUNT(*) FILTER (WHERE errmask <> 0), {failure_counts}, "
+                f"(SELECT batch_key FROM batch ORDER BY batch_key DESC LIMIT 1) FROM batch"
+            ), batch_params).one()
+            total += counts[0]
+            invalid_rows += counts[1]
+            failures = [seen + batch_failures for seen, batch_failures in zip(failures, counts[2:-1])]
+            
+            remaining_samples = self.max_invalid_samples - len(records)
+            if counts[1] and remaining_samples > 0:
+                batch_params["max_samples"] = remaining_samples
+                records.extend(self.conn.execute(text(
+                    f"{batch} SELECT {column_list}, errmask FROM batch WHERE errmask <> 0 LIMIT :max_samples"
+                ), batch_params).fetchall())
+            
+            logger.info(f"Checked {total}/{limit} rows of {source} ({invalid_rows} invalid so far)")
+            if counts[0] < batch_size:
+                break
+            last_key = counts[-1]
+        
+        return total, invalid_rows, failures, records
+    
     def _check_users_table(self, limit: Optional[int] = None) -> Dict[str, Any]:
         """Check users table for Firebase UID format compliance"""
         result = {
@@ -149,42 +589,33 @@ class DatabaseConsistencyChecker:
             "invalid_records": []
         }
         
-        # Build query
-        query = "SELECT id, email, handle FROM users"
-        params = {}
-        if limit:
-            query += " LIMIT :limit"
-            params["limit"] = limit
-        
         try:
-            records = self.db.execute(text(query), params).fetchall()
+            total, invalid_ids, _, records = self._scan_id_columns(
+                "users", ["id", "email", "handle"], [self._invalid_id_sql("users", "id", IDType.FIREBASE_UID)],
+                limit, key="id"
+            )
+            result["total_checked"] = total
+            result["valid_ids"] = total - invalid_ids
+            result["invalid_ids"] = invalid_ids
+            result["total_errors"] = invalid_ids
             
-            for record in records:
-                user_id, email, handle = record
-                result["total_checked"] += 1
+            for user_id, email, handle, errmask in records:
+                error = _invalid_id_error(user_id, IDType.FIREBASE_UID, f"user record (email: {email})")
+                result["invalid_records"].append({
+                    "id": str(user_id),
+                    "email": email,
+                    "handle": handle,
+                    "error": error,
+                    "error_type": "invalid_firebase_uid"
+                })
                 
-                try:
-                    validate_firebase_uid(user_id, f"user record (email: {email})")
-                    result["valid_ids"] += 1
-                    
-                except IDValidationError as e:
-                    result["invalid_ids"] += 1
-                    result["total_errors"] += 1
-                    result["invalid_records"].append({
-                        "id": str(user_id),
-                        "email": email,
-                        "handle": handle,
-                        "error": str(e),
-                        "error_type": "invalid_firebase_uid"
-                    })
-                    
-                    if self.verbose:
-                        logger.warning(f"Invalid user ID: {user_id} (email: {email}) - {e}")
+                if self.verbose:
+                    logger.warning(f"Invalid user ID: {user_id} (email: {email}) - {error}")
+            
+            del result["invalid_records"][self.max_invalid_samples:]
         
         except Exception as e:
-            logger.error(f"Failed to check users table: {e}")
-            result["error"] = str(e)
-            result["total_errors"] += 1
+            self._record_check_failure(result, "users", e)
         
         logger.info(f"Users table: {result['valid_ids']}/{result['total_checked']} valid IDs")
         return result
@@ -202,57 +633,50 @@ class DatabaseConsistencyChecker:
             "invalid_records": []
         }
         
-        # Build query
-        query = "SELECT id, user_id, title FROM photos"
-        params = {}
-        if limit:
-            query += " LIMIT :limit"
-            params["limit"] = limit
-        
         try:
-            records = self.db.execute(text(query), params).fetchall()
+            total, _, (invalid_photo_ids, invalid_user_refs), records = self._scan_id_columns(
+                "photos", ["id", "user_id", "title"],
+                [self._invalid_id_sql("photos", "id", IDType.UUID_OBJECT),
+                 self._invalid_id_sql("photos", "user_id", IDType.FIREBASE_UID)],
+                limit, key="id"
+            )
+            result["total_checked"] = total
+            result["valid_photo_ids"] = total - invalid_photo_ids
+            result["invalid_photo_ids"] = invalid_photo_ids
+            result["valid_user_refs"] = total - invalid_user_refs
+            result["invalid_user_refs"] = invalid_user_refs
+            result["total_errors"] = invalid_photo_ids + invalid_user_refs
             
-            for record in records:
-                photo_id, user_id, title = record
-                result["total_checked"] += 1
-                
+            for photo_id, user_id, title, errmask in records:
                 # Check photo ID (should be UUID)
-                try:
-                    validate_uuid(photo_id, f"photo record (title: {title})")
-                    result["valid_photo_ids"] += 1
-                except IDValidationError as e:
-                    result["invalid_photo_ids"] += 1
-                    result["total_errors"] += 1
+                if errmask & 1:
+                    error = _invalid_id_error(photo_id, IDType.UUID_OBJECT, f"photo record (title: {title})")
                     result["invalid_records"].append({
                         "photo_id": str(photo_id),
                         "user_id": str(user_id),
                         "title": title or "Untitled",
-                        "error": f"Invalid photo ID: {str(e)}",
+                        "error": f"Invalid photo ID: {error}",
                         "error_type": "invalid_photo_uuid"
                     })
                 
                 # Check user_id reference (should be Firebase UID)
-                try:
-                    validate_firebase_uid(user_id, f"photo user_id reference (title: {title})")
-                    result["valid_user_refs"] += 1
-                except IDValidationError as e:
-                    result["invalid_user_refs"] += 1
-                    result["total_errors"] += 1
+                if errmask & 2:
+                    error = _invalid_id_error(user_id, IDType.FIREBASE_UID, f"photo user_id reference (title: {title})")
                     result["invalid_records"].append({
                         "photo_id": str(photo_id),
                         "user_id": str(user_id),
                         "title": title or "Untitled",
-                        "error": f"Invalid user_id reference: {str(e)}",
+                        "error": f"Invalid user_id reference: {error}",
                         "error_type": "invalid_user_reference"
                     })
                 
-                if self.verbose and (result["invalid_photo_ids"] > 0 or result["invalid_user_refs"] > 0):
+                if self.verbose:
                     logger.warning(f"Issues with photo {photo_id} (user: {user_id})")
+            
+            del result["invalid_records"][self.max_invalid_samples:]
         
         except Exception as e:
-            logger.error(f"Failed to check photos table: {e}")
-            result["error"] = str(e)
-            result["total_errors"] += 1
+            self._record_check_failure(result, "photos", e)
         
         logger.info(f"Photos table: {result['valid_photo_ids']}/{result['total_checked']} valid photo IDs, "
                    f"{result['valid_user_refs']}/{result['total_checked']} valid user refs")
@@ -264,246 +688,110 @@ class DatabaseConsistencyChecker:
     
     def _check_photo_collaborators_table(self, limit: Optional[int] = None) -> Dict[str, Any]:
         """Check photo_collaborators table for UUID and Firebase UID compliance"""
-        result = {
-            "table": "photo_collaborators",
-            "total_checked": 0,
-            "valid_ids": 0,
-            "invalid_ids": 0,
-            "total_errors": 0,
-            "invalid_records": []
-        }
-        
-        query = "SELECT id, photo_id, user_id, display_name FROM photo_collaborators"
-        params = {}
-        if limit:
-            query += " LIMIT :limit"
-            params["limit"] = limit
-        
-        try:
-            records = self.db.execute(text(query), params).fetchall()
-            
-            for record in records:
-                collab_id, photo_id, user_id, display_name = record
-                result["total_checked"] += 1
-                record_valid = True
-                
-                # Check collaborator ID (should be UUID)
-                try:
-                    validate_uuid(collab_id, f"collaborator record")
-                except IDValidationError as e:
-                    record_valid = False
-                    result["invalid_records"].append({
-                        "id": str(collab_id),
-                        "photo_id": str(photo_id),
-                        "user_id": str(user_id),
-                        "display_name": display_name,
-                        "error": f"Invalid collaborator ID: {str(e)}",
-                        "error_type": "invalid_collaborator_uuid"
-                    })
-                
-                # Check photo_id reference (should be UUID)
-                try:
-                    validate_uuid(photo_id, f"collaborator photo_id reference")
-                except IDValidationError as e:
-                    record_valid = False
-                    result["invalid_records"].append({
-                        "id": str(collab_id),
-                        "photo_id": str(photo_id),
-                        "user_id": str(user_id),
-                        "display_name": display_name,
-                        "error": f"Invalid photo_id reference: {str(e)}",
-                        "error_type": "invalid_photo_reference"
-                    })
-                
-                # Check user_id reference (should be Firebase UID, but can be NULL)
-                if user_id is not None:
-                    try:
-                        validate_firebase_uid(user_id, f"collaborator user_id reference")
-                    except IDValidationError as e:
-                        record_valid = False
-                        result["invalid_records"].append({
-                            "id": str(collab_id),
-                            "photo_id": str(photo_id),
-                            "user_id": str(user_id),
-                            "display_name": display_name,
-                            "error": f"Invalid user_id reference: {str(e)}",
-                            "error_type": "invalid_user_reference"
-                        })
-                
-                if record_valid:
-                    result["valid_ids"] += 1
-                else:
-                    result["invalid_ids"] += 1
-                    result["total_errors"] += 1
-        
-        except Exception as e:
-            logger.error(f"Failed to check photo_collaborators table: {e}")
-            result["error"] = str(e)
-            result["total_errors"] += 1
-        
-        logger.info(f"Photo collaborators table: {result['valid_ids']}/{result['total_checked']} valid records")
-        return result
+        return self._check_reference_table(
+            "photo_collaborators", "Photo collaborators", "display_name",
+            [
+                ("id", IDType.UUID_OBJECT, "collaborator record",
+                 "Invalid collaborator ID", "invalid_collaborator_uuid"),
+                ("photo_id", IDType.UUID_OBJECT, "collaborator photo_id reference",
+                 "Invalid photo_id reference", "invalid_photo_reference"),
+                # user_id can be NULL once the collaborator's account is deleted
+                ("user_id", IDType.FIREBASE_UID, "collaborator user_id reference",
+                 "Invalid user_id reference", "invalid_user_reference"),
+            ],
+            limit, nullable_columns={"user_id"}
+        )
     
     def _check_photo_interactions_table(self, limit: Optional[int] = None) -> Dict[str, Any]:
         """Check photo_interactions table for UUID and Firebase UID compliance"""
-        result = {
-            "table": "photo_interactions",
-            "total_checked": 0,
-            "valid_ids": 0,
-            "invalid_ids": 0,
-            "total_errors": 0,
-            "invalid_records": []
-        }
-        
-        query = "SELECT id, photo_id, user_id, interaction_type FROM photo_interactions"
-        params = {}
-        if limit:
-            query += " LIMIT :limit"
-            params["limit"] = limit
-        
-        try:
-            records = self.db.execute(text(query), params).fetchall()
-            
-            for record in records:
-                interaction_id, photo_id, user_id, interaction_type = record
-                result["total_checked"] += 1
-                record_valid = True
-                
-                # Check interaction ID (should be UUID)
-                try:
-                    validate_uuid(interaction_id, f"interaction record")
-                except IDValidationError as e:
-                    record_valid = False
-                    result["invalid_records"].append({
-                        "id": str(interaction_id),
-                        "photo_id": str(photo_id),
-                        "user_id": str(user_id),
-                        "interaction_type": interaction_type,
-                        "error": f"Invalid interaction ID: {str(e)}",
-                        "error_type": "invalid_interaction_uuid"
-                    })
-                
-                # Check photo_id reference (should be UUID)
-                try:
-                    validate_uuid(photo_id, f"interaction photo_id reference")
-                except IDValidationError as e:
-                    record_valid = False
-                    result["invalid_records"].append({
-                        "id": str(interaction_id),
-                        "photo_id": str(photo_id),
-                        "user_id": str(user_id),
-                        "interaction_type": interaction_type,
-                        "error": f"Invalid photo_id reference: {str(e)}",
-                        "error_type": "invalid_photo_reference"
-                    })
-                
-                # Check user_id reference (should be Firebase UID)
-                try:
-                    validate_firebase_uid(user_id, f"interaction user_id reference")
-                except IDValidationError as e:
-                    record_valid = False
-                    result["invalid_records"].append({
-                        "id": str(interaction_id),
-                        "photo_id": str(photo_id),
-                        "user_id": str(user_id),
-                        "interaction_type": interaction_type,
-                        "error": f"Invalid user_id reference: {str(e)}",
-                        "error_type": "invalid_user_reference"
-                    })
-                
-                if record_valid:
-                    result["valid_ids"] += 1
-                else:
-                    result["invalid_ids"] += 1
-                    result["total_errors"] += 1
-        
-        except Exception as e:
-            logger.error(f"Failed to check photo_interactions table: {e}")
-            result["error"] = str(e)
-            result["total_errors"] += 1
-        
-        logger.info(f"Photo interactions table: {result['valid_ids']}/{result['total_checked']} valid records")
-        return result
+        return self._check_reference_table(
+            "photo_interactions", "Photo interactions", "interaction_type",
+            [
+                ("id", IDType.UUID_OBJECT, "interaction record",
+                 "Invalid interaction ID", "invalid_interaction_uuid"),
+                ("photo_id", IDType.UUID_OBJECT, "interaction photo_id reference",
+                 "Invalid photo_id reference", "invalid_photo_reference"),
+                ("user_id", IDType.FIREBASE_UID, "interaction user_id reference",
+                 "Invalid user_id reference", "invalid_user_reference"),
+            ],
+            limit
+        )
     
     def _check_user_connections_table(self, limit: Optional[int] = None) -> Dict[str, Any]:
         """Check user_connections table for Firebase UID format compliance"""
+        return self._check_reference_table(
+            "user_connections", "User connections", "status",
+            [
+                ("id", IDType.UUID_OBJECT, "connection record",
+                 "Invalid connection ID", "invalid_connection_uuid"),
+                ("requester_id", IDType.FIREBASE_UID, "connection requester_id",
+                 "Invalid requester_id", "invalid_requester_reference"),
+                ("target_id", IDType.FIREBASE_UID, "connection target_id",
+                 "Invalid target_id", "invalid_target_reference"),
+            ],
+            limit
+        )
+    
+    def _check_reference_table(self, table_name: str, label: str, detail_column: str,
+                               checks: List[Tuple[str, IDType, str, str, str]],
+                               limit: Optional[int] = None,
+                               nullable_columns: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """
+        Check a table whose rows carry a UUID id plus UUID/Firebase UID references
+        
+        Args:
+            table_name: Table to check
+            label: Table name for the log line
+            detail_column: Descriptive column reported with invalid rows
+            checks: (column, expected IDType, validation context, error prefix,
+                     error_type) per ID column, in report order
+            limit: Maximum rows to check (None for no limit)
+            nullable_columns: ID columns where NULL is allowed
+        """
         result = {
-            "table": "user_connections",
+            "table": table_name,
             "total_checked": 0,
             "valid_ids": 0,
             "invalid_ids": 0,
             "total_errors": 0,
             "invalid_records": []
         }
+        nullable_columns = nullable_columns or set()
         
-        query = "SELECT id, requester_id, target_id, status FROM user_connections"
-        params = {}
-        if limit:
-            query += " LIMIT :limit"
-            params["limit"] = limit
+        predicates = [
+            self._invalid_id_sql(table_name, column, expected, nullable=column in nullable_columns)
+            for column, expected, _, _, _ in checks
+        ]
         
         try:
-            records = self.db.execute(text(query), params).fetchall()
+            total, invalid_rows, _, records = self._scan_id_columns(
+                table_name, [check[0] for check in checks] + [detail_column], predicates, limit
+            )
+            result["total_checked"] = total
+            result["valid_ids"] = total - invalid_rows
+            result["invalid_ids"] = invalid_rows
+            result["total_errors"] = invalid_rows
             
             for record in records:
-                connection_id, requester_id, target_id, status = record
-                result["total_checked"] += 1
-                record_valid = True
+                *id_values, detail, errmask = record
+                base_entry = {check[0]: str(value) for check, value in zip(checks, id_values)}
+                base_entry[detail_column] = detail
                 
-                # Check connection ID (should be UUID)
-                try:
-                    validate_uuid(connection_id, f"connection record")
-                except IDValidationError as e:
-                    record_valid = False
-                    result["invalid_records"].append({
-                        "id": str(connection_id),
-                        "requester_id": str(requester_id),
-                        "target_id": str(target_id),
-                        "status": status,
-                        "error": f"Invalid connection ID: {str(e)}",
-                        "error_type": "invalid_connection_uuid"
-                    })
-                
-                # Check requester_id (should be Firebase UID)
-                try:
-                    validate_firebase_uid(requester_id, f"connection requester_id")
-                except IDValidationError as e:
-                    record_valid = False
-                    result["invalid_records"].append({
-                        "id": str(connection_id),
-                        "requester_id": str(requester_id),
-                        "target_id": str(target_id),
-                        "status": status,
-                        "error": f"Invalid requester_id: {str(e)}",
-                        "error_type": "invalid_requester_reference"
-                    })
-                
-                # Check target_id (should be Firebase UID)
-                try:
-                    validate_firebase_uid(target_id, f"connection target_id")
-                except IDValidationError as e:
-                    record_valid = False
-                    result["invalid_records"].append({
-                        "id": str(connection_id),
-                        "requester_id": str(requester_id),
-                        "target_id": str(target_id),
-                        "status": status,
-                        "error": f"Invalid target_id: {str(e)}",
-                        "error_type": "invalid_target_reference"
-                    })
-                
-                if record_valid:
-                    result["valid_ids"] += 1
-                else:
-                    result["invalid_ids"] += 1
-                    result["total_errors"] += 1
+                for bit, (_, expected, context, prefix, error_type) in enumerate(checks):
+                    if errmask & (1 << bit):
+                        error = _invalid_id_error(id_values[bit], expected, context)
+                        result["invalid_records"].append({
+                            **base_entry,
+                            "error": f"{prefix}: {error}",
+                            "error_type": error_type
+                        })
+            
+            del result["invalid_records"][self.max_invalid_samples:]
         
         except Exception as e:
-            logger.error(f"Failed to check user_connections table: {e}")
-            result["error"] = str(e)
-            result["total_errors"] += 1
+            self._record_check_failure(result, table_name, e)
         
-        logger.info(f"User connections table: {result['valid_ids']}/{result['total_checked']} valid records")
+        logger.info(f"{label} table: {result['valid_ids']}/{result['total_checked']} valid records")
         return result
     
     def _check_table_with_user_refs(self, table_name: str, user_id_column: str, limit: Optional[int] = None) -> Dict[str, Any]:
@@ -517,35 +805,26 @@ class DatabaseConsistencyChecker:
             "invalid_records": []
         }
         
-        query = f"SELECT {user_id_column} FROM {table_name}"
-        params = {}
-        if limit:
-            query += " LIMIT :limit"
-            params["limit"] = limit
-        
         try:
-            records = self.db.execute(text(query), params).fetchall()
+            total, invalid_ids, _, records = self._scan_id_columns(
+                table_name, [user_id_column], [self._invalid_id_sql(table_name, user_id_column, IDType.FIREBASE_UID)], limit
+            )
+            result["total_checked"] = total
+            result["valid_ids"] = total - invalid_ids
+            result["invalid_ids"] = invalid_ids
+            result["total_errors"] = invalid_ids
             
-            for record in records:
-                user_id = record[0]
-                result["total_checked"] += 1
-                
-                try:
-                    validate_firebase_uid(user_id, f"{table_name} {user_id_column}")
-                    result["valid_ids"] += 1
-                except IDValidationError as e:
-                    result["invalid_ids"] += 1
-                    result["total_errors"] += 1
-                    result["invalid_records"].append({
-                        user_id_column: str(user_id),
-                        "error": str(e),
-                        "error_type": "invalid_user_reference"
-                    })
+            for user_id, errmask in records:
+                result["invalid_records"].append({
+                    user_id_column: str(user_id),
+                    "error": _invalid_id_error(user_id, IDType.FIREBASE_UID, f"{table_name} {user_id_column}"),
+                    "error_type": "invalid_user_reference"
+                })
+            
+            del result["invalid_records"][self.max_invalid_samples:]
         
         except Exception as e:
-            logger.error(f"Failed to check {table_name} table: {e}")
-            result["error"] = str(e)
-            result["total_errors"] += 1
+            self._record_check_failure(result, table_name, e)
         
         logger.info(f"{table_name} table: {result['valid_ids']}/{result['total_checked']} valid user references")
         return result
@@ -554,122 +833,142 @@ class DatabaseConsistencyChecker:
         """Check referential integrity between tables"""
         logger.info("Checking referential integrity")
         
+        # All orphan lookups go to the server as one UNION ALL statement
+        # (one round-trip); each branch is tagged with its position so the rows
+        # can be dealt back out. The user references share one anti-join
+        # against users, tagged per column. If the statement fails (e.g. a
+        # table is missing), fall back to running the lookups one by one so
+        # the others still report.
+        lookups = [self._orphaned_photos_sql()]
+        lookups += [self._orphaned_refs_sql(table, column, "photos") for table, column in PHOTO_REFERENCE_COLUMNS]
+        
+        try:
+            branches = [f"(SELECT {position} AS lookup, o.* FROM ({sql}) o)" for position, sql in enumerate(lookups)]
+            branches.append(
+                f"(SELECT {len(lookups)} + o.src AS lookup, o.ref, o.user_id, o.title, o.count "
+                f"FROM ({self._orphaned_user_refs_sql(USER_REFERENCE_COLUMNS)}) o)"
+            )
+            query = " UNION ALL ".join(branches)
+            rows_by_lookup = [[] for _ in range(len(lookups) + len(USER_REFERENCE_COLUMNS))]
+            for row in self.conn.execute(text(query)).fetchall():
+                rows_by_lookup[row[0]].append(row[1:])
+        except Exception as e:
+            logger.warning(f"Batched referential integrity check failed, checking one by one: {e}")
+            self._begin_snapshot()
+            self.results["referential_integrity"] = {
+                "orphaned_photos": self._find_orphaned_photos(),
+                "orphaned_photo_refs": self._find_orphaned_photo_references(),
+                "orphaned_user_refs": self._find_orphaned_user_references()
+            }
+            return
+        
+        photo_ref_rows = rows_by_lookup[1:1 + len(PHOTO_REFERENCE_COLUMNS)]
+        user_ref_rows = rows_by_lookup[1 + len(PHOTO_REFERENCE_COLUMNS):]
         self.results["referential_integrity"] = {
-            "orphaned_photos": self._find_orphaned_photos(),
-            "orphaned_photo_refs": self._find_orphaned_photo_references(),
-            "orphaned_user_refs": self._find_orphaned_user_references()
+            "orphaned_photos": self._orphaned_photos_result(rows_by_lookup[0]),
+            "orphaned_photo_refs": self._orphaned_refs_result(PHOTO_REFERENCE_COLUMNS, photo_ref_rows, "photo_id"),
+            "orphaned_user_refs": self._orphaned_refs_result(USER_REFERENCE_COLUMNS, user_ref_rows, "user_id")
         }
     
+    def _orphaned_photos_sql(self) -> str:
+        """Photos whose user_id has no user: (photo_id, user_id, title, count)"""
+        return """
+            SELECT p.id::text AS ref, p.user_id::text AS user_id, p.title::text AS title, NULL::bigint AS count
+            FROM photos p 
+            WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.id = p.user_id)
+            LIMIT 100
+        """
+    
+    def _orphaned_refs_sql(self, table: str, column: str, parent: str) -> str:
+        """Values of table.column with no row in parent: (ref, NULL, NULL, count)"""
+        return f"""
+            SELECT t.{column}::text AS ref, NULL::text AS user_id, NULL::text AS title, COUNT(*) AS count
+            FROM {table} t
+            WHERE t.{column} IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM {parent} p WHERE p.id = t.{column})
+            GROUP BY t.{column}
+            LIMIT 50
+        """
+    
+    def _orphaned_user_refs_sql(self, columns: List[Tuple[str, str]]) -> str:
+        """
+        Values of each (table, column) with no user, from a single anti-join
+        
+        Rows are (src, ref, NULL, NULL, count) where src is the position in
+        columns. Gathering every reference first lets users be probed once
+        for all columns instead of once per column.
+        """
+        refs = " UNION ALL ".join(
+            f"SELECT {src} AS src, {column}::text AS ref FROM {table} WHERE {column} IS NOT NULL"
+            for src, (table, column) in enumerate(columns)
+        )
+        return f"""
+            SELECT src, ref, NULL::text AS user_id, NULL::text AS title, count
+            FROM (
+                SELECT src, ref, COUNT(*) AS count,
+                       row_number() OVER (PARTITION BY src ORDER BY ref) AS position
+                FROM ({refs}) r
+                WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.id = r.ref)
+                GROUP BY src, ref
+            ) orphans
+            WHERE position <= 50
+        """
+    
+    def _orphaned_photos_result(self, records: List[Any]) -> Dict[str, Any]:
+        """Build the orphaned_photos report section"""
+        return {
+            "total_checked": len(records),
+            "orphaned_count": len(records),
+            "orphaned_records": [
+                {"photo_id": photo_id, "user_id": user_id, "title": title}
+                for photo_id, user_id, title, _ in records
+            ]
+        }
+    
+    def _orphaned_refs_result(self, columns: List[Tuple[str, str]], records_per_column: List[List[Any]],
+                              ref_key: str) -> Dict[str, Any]:
+        """Build an orphaned_*_refs report section from per-(table, column) rows"""
+        result = {"tables_checked": [], "total_orphaned": 0}
+        for (table, column), records in zip(columns, records_per_column):
+            result["tables_checked"].append({
+                "table": table,
+                "column": column,
+                "orphaned_count": len(records),
+                "orphaned_refs": [{ref_key: ref, "count": count} for ref, _, _, count in records]
+            })
+            result["total_orphaned"] += len(records)
+        return result
+    
     def _find_orphaned_photos(self) -> Dict[str, Any]:
         """Find photos that reference non-existent users"""
-        result = {"total_checked": 0, "orphaned_count": 0, "orphaned_records": []}
-        
         try:
-            query = """
-                SELECT p.id, p.user_id, p.title 
-                FROM photos p 
-                LEFT JOIN users u ON p.user_id = u.id 
-                WHERE u.id IS NULL
-                LIMIT 100
-            """
-            
-            records = self.db.execute(text(query)).fetchall()
-            
-            for record in records:
-                photo_id, user_id, title = record
-                result["total_checked"] += 1
-                result["orphaned_count"] += 1
-                result["orphaned_records"].append({
-                    "photo_id": str(photo_id),
-                    "user_id": str(user_id),
-                    "title": title
-                })
-        
+            return self._orphaned_photos_result(self.conn.execute(text(self._orphaned_photos_sql())).fetchall())
         except Exception as e:
             logger.error(f"Failed to check orphaned photos: {e}")
-            result["error"] = str(e)
-        
-        return result
+            self._begin_snapshot()
+            return {"total_checked": 0, "orphaned_count": 0, "orphaned_records": [], "error": str(e)}
     
     def _find_orphaned_photo_references(self) -> Dict[str, Any]:
         """Find records that reference non-existent photos"""
-        result = {"tables_checked": [], "total_orphaned": 0}
-        
-        tables_to_check = [
-            ("photo_collaborators", "photo_id"),
-            ("photo_interactions", "photo_id")
-        ]
-        
-        for table, column in tables_to_check:
-            try:
-                query = f"""
-                    SELECT {column}, COUNT(*) as count
-                    FROM {table} t
-                    LEFT JOIN photos p ON t.{column} = p.id
-                    WHERE p.id IS NULL
-                    GROUP BY {column}
-                    LIMIT 50
-                """
-                
-                records = self.db.execute(text(query)).fetchall()
-                
-                table_result = {
-                    "table": table,
-                    "column": column,
-                    "orphaned_count": len(records),
-                    "orphaned_refs": [{"photo_id": str(r[0]), "count": r[1]} for r in records]
-                }
-                
-                result["tables_checked"].append(table_result)
-                result["total_orphaned"] += len(records)
-                
-            except Exception as e:
-                logger.error(f"Failed to check orphaned photo refs in {table}: {e}")
-        
-        return result
+        return self._find_orphaned_refs(PHOTO_REFERENCE_COLUMNS, "photos", "photo_id")
     
     def _find_orphaned_user_references(self) -> Dict[str, Any]:
         """Find records that reference non-existent users"""
-        result = {"tables_checked": [], "total_orphaned": 0}
-        
-        tables_to_check = [
-            ("photo_collaborators", "user_id"),
-            ("photo_interactions", "user_id"),
-            ("user_specialties", "user_id"),
-            ("user_connections", "requester_id"),
-            ("user_connections", "target_id")
-        ]
-        
-        for table, column in tables_to_check:
+        return self._find_orphaned_refs(USER_REFERENCE_COLUMNS, "users", "user_id")
+    
+    def _find_orphaned_refs(self, columns: List[Tuple[str, str]], parent: str, ref_key: str) -> Dict[str, Any]:
+        """Run the orphan lookup for each (table, column) on its own, skipping failures"""
+        checked_columns, records_per_column = [], []
+        for table, column in columns:
             try:
-                # Skip NULL user_id values for photo_collaborators
-                where_clause = f"t.{column} IS NOT NULL AND u.id IS NULL"
-                
-                query = f"""
-                    SELECT t.{column}, COUNT(*) as count
-                    FROM {table} t
-                    LEFT JOIN users u ON t.{column} = u.id
-                    WHERE {where_clause}
-                    GROUP BY t.{column}
-                    LIMIT 50
-                """
-                
-                records = self.db.execute(text(query)).fetchall()
-                
-                table_result = {
-                    "table": table,
-                    "column": column,
-                    "orphaned_count": len(records),
-                    "orphaned_refs": [{"user_id": str(r[0]), "count": r[1]} for r in records]
-                }
-                
-                result["tables_checked"].append(table_result)
-                result["total_orphaned"] += len(records)
-                
+                records = self.conn.execute(text(self._orphaned_refs_sql(table, column, parent))).fetchall()
             except Exception as e:
-                logger.error(f"Failed to check orphaned user refs in {table}.{column}: {e}")
-        
-        return result
+                logger.error(f"Failed to check orphaned {parent} refs in {table}.{column}: {e}")
+                self._begin_snapshot()
+                continue
+            checked_columns.append((table, column))
+            records_per_column.append(records)
+        return self._orphaned_refs_result(checked_columns, records_per_column, ref_key)
     
     def _generate_summary(self):
         """Generate summary statistics"""
@@ -679,6 +978,11 @@ class DatabaseConsistencyChecker:
         # Calculate overall health score
         health_score = ((total_records - total_errors) / total_records * 100) if total_records > 0 else 0
         
+        timed_out_tables = [
+            table_name for table_name, table_result in self.results["table_results"].items()
+            if table_result.get("timed_out")
+        ]
+        
         # Count orphaned records
         ref_integrity = self.results.get("referential_integrity", {})
         total_orphaned = (
@@ -693,7 +997,12 @@ class DatabaseConsistencyChecker:
             "health_score": health_score,
             "tables_checked": len(self.results["tables_checked"]),
             "referential_integrity_issues": total_orphaned,
-            "overall_status": "healthy" if total_errors == 0 and total_orphaned == 0 else "issues_found"
+            "timed_out_tables": timed_out_tables,
+            "overall_status": (
+                "issues_found" if total_errors or total_orphaned
+                else "incomplete" if timed_out_tables
+                else "healthy"
+            )
         }
         
         logger.info(f"Database consistency check complete:")
@@ -701,11 +1010,38 @@ class DatabaseConsistencyChecker:
         logger.info(f"  Errors found: {total_errors}")
         logger.info(f"  Health score: {health_score:.1f}%")
         logger.info(f"  Referential integrity issues: {total_orphaned}")
+        if timed_out_tables:
+            logger.info(f"  Timed out: {', '.join(timed_out_tables)}")
+
+
+def _print_results(results: Dict[str, Any], verbose: bool):
+    """Print the run summary, plus per-table counts when verbose"""
+    print("\n" + "="*60)
+    print("DATABASE CONSISTENCY CHECK RESULTS")
+    print("="*60)
     
-    def __del__(self):
-        """Cleanup database connection"""
-        if hasattr(self, 'db'):
-            self.db.close()
+    summary = results["summary"]
+    print(f"Tables checked: {', '.join(results['tables_checked'])}")
+    print(f"Total records checked: {summary['total_records_checked']}")
+    print(f"Total errors found: {summary['total_errors']}")
+    print(f"Health score: {summary['health_score']:.1f}%")
+    print(f"Referential integrity issues: {summary['referential_integrity_issues']}")
+    if summary["timed_out_tables"]:
+        print(f"Timed out (not fully checked): {', '.join(summary['timed_out_tables'])}")
+    print(f"Overall status: {summary['overall_status']}")
+    
+    # Show table-specific results
+    if verbose:
+        print(f"\nTable-specific results:")
+        for table_name, table_result in results["table_results"].items():
+            if table_result.get("timed_out"):
+                print(f"  {table_name}: TIMED OUT - {table_result['error']}")
+            elif "error" in table_result:
+                print(f"  {table_name}: ERROR - {table_result['error']}")
+            else:
+                valid_count = table_result.get("valid_ids", 0) or table_result.get("valid_photo_ids", 0) + table_result.get("valid_user_refs", 0)
+                total_count = table_result.get("total_checked", 0)
+                print(f"  {table_name}: {valid_count}/{total_count} valid")
 
 
 def main():
@@ -719,6 +1055,8 @@ Examples:
   %(prog)s --user-limit 1000 --photo-limit 2000  # Check with custom limits
   %(prog)s --report-file db_report.json      # Generate detailed report
   %(prog)s --tables users,photos --verbose   # Check specific tables only
+  %(prog)s --sample-percent 1                # Full scan only where a 1%% sample fails
+  %(prog)s --fast                            # Trust uuid types and UID CHECK constraints
         """
     )
     
@@ -739,6 +1077,41 @@ Examples:
         help="Comma-separated list of tables to check (default: all)"
     )
     
+    parser.add_argument(
+        "--sample-percent",
+        type=_sample_percent,
+        help="Check a TABLESAMPLE of this percentage of each table first and "
+             "skip the full scan when it is clean (default: always full scan)"
+    )
+    
+    parser.add_argument(
+        "--max-invalid-samples",
+        type=int,
+        default=DEFAULT_MAX_INVALID_SAMPLES,
+        help=f"Invalid records kept per table in the report (default: {DEFAULT_MAX_INVALID_SAMPLES})"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_CHECK_WORKERS,
+        help=f"Tables checked concurrently, one connection each (default: {DEFAULT_CHECK_WORKERS})"
+    )
+    
+    parser.add_argument(
+        "--statement-timeout",
+        type=_statement_timeout,
+        help="Cancel any single check statement running longer than this, e.g. 30min; "
+             "the table is then reported as timed out (default: no limit)"
+    )
+    
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Trust the schema: only look for NULLs in uuid-typed columns and in columns "
+             "with a validated Firebase UID CHECK constraint (default: check every value)"
+    )
+    
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -747,7 +1120,7 @@ Examples:
     
     parser.add_argument(
         "--report-file",
-        help="Save detailed consistency report to JSON file"
+        help="Save detailed consistency report to JSON file (JSON Lines if it ends in .jsonl)"
     )
     
     parser.add_argument(
@@ -771,46 +1144,31 @@ Examples:
     
     # Run consistency check
     try:
-        checker = DatabaseConsistencyChecker(verbose=args.verbose)
-        results = checker.check_all_tables(
-            user_limit=args.user_limit,
-            photo_limit=args.photo_limit,
-            tables=tables_filter
-        )
+        with DatabaseConsistencyChecker(
+            verbose=args.verbose,
+            max_invalid_samples=args.max_invalid_samples,
+            workers=args.workers,
+            fast=args.fast,
+            statement_timeout=args.statement_timeout
+        ) as checker:
+            results = checker.check_all_tables(
+                user_limit=args.user_limit,
+                photo_limit=args.photo_limit,
+                tables=tables_filter,
+                sample_percent=args.sample_percent
+            )
     except Exception as e:
         logger.error(f"Failed to run consistency check: {e}")
         return 1
     
     # Display results
     if not args.quiet:
-        print("\n" + "="*60)
-        print("DATABASE CONSISTENCY CHECK RESULTS")
-        print("="*60)
-        
-        summary = results["summary"]
-        print(f"Tables checked: {', '.join(results['tables_checked'])}")
-        print(f"Total records checked: {summary['total_records_checked']}")
-        print(f"Total errors found: {summary['total_errors']}")
-        print(f"Health score: {summary['health_score']:.1f}%")
-        print(f"Referential integrity issues: {summary['referential_integrity_issues']}")
-        print(f"Overall status: {summary['overall_status']}")
-        
-        # Show table-specific results
-        if args.verbose:
-            print(f"\nTable-specific results:")
-            for table_name, table_result in results["table_results"].items():
-                if "error" in table_result:
-                    print(f"  {table_name}: ERROR - {table_result['error']}")
-                else:
-                    valid_count = table_result.get("valid_ids", 0) or table_result.get("valid_photo_ids", 0) + table_result.get("valid_user_refs", 0)
-                    total_count = table_result.get("total_checked", 0)
-                    print(f"  {table_name}: {valid_count}/{total_count} valid")
+        _print_results(results, args.verbose)
     
     # Save report if requested
     if args.report_file:
         try:
-            with open(args.report_file, 'w') as f:
-                json.dump(results, f, indent=2, default=str)
+            _write_report(args.report_file, results)
             logger.info(f"Detailed report saved to {args.report_file}")
         except Exception as e:
             logger.error(f"Failed to save report: {e}")
@@ -1,74 +1,87 @@
 #!/usr/bin/env python3
 """Test script to verify GCP setup for Lumen project"""
 
+import io
 import os
-from google.cloud import storage
-from google.oauth2 import service_account
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-def test_cloud_storage():
-    """Test Cloud Storage access"""
+@lru_cache(maxsize=1)
+def _storage_client(project_id, cred_path):
+    """Storage client for the service account, built once per process"""
+    # Imported here so the other checks don't pay for loading the GCS SDK
+    from google.cloud import storage
+    from google.oauth2 import service_account
+    
+    credentials = service_account.Credentials.from_service_account_file(cred_path)
+    return storage.Client(project=project_id, credentials=credentials)
+
+def test_cloud_storage(out=None):
+    """Test Cloud Storage access (report lines go to out, default stdout)"""
     project_id = os.getenv("PROJECT_ID")
     bucket_name = os.getenv("GCS_BUCKET_NAME")
     
-    print(f"\n📸 Testing Cloud Storage access...")
-    print(f"📦 Bucket: {bucket_name}")
+    print(f"\n📸 Testing Cloud Storage access...", file=out)
+    print(f"📦 Bucket: {bucket_name}", file=out)
     
     try:
         cred_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.getenv("GOOGLE_APPLICATION_CREDENTIALS"))
-        credentials = service_account.Credentials.from_service_account_file(cred_path)
-        client = storage.Client(project=project_id, credentials=credentials)
+        client = _storage_client(project_id, cred_path)
         bucket = client.bucket(bucket_name)
         
         if bucket.exists():
-            print(f"✅ Bucket '{bucket_name}' exists and is accessible")
+            print(f"✅ Bucket '{bucket_name}' exists and is accessible", file=out)
             
-            # Try to upload a test file
-            blob = bucket.blob("test/setup_verification.txt")
-            blob.upload_from_string("Lumen GCP setup verified!")
-            print("✅ Successfully uploaded test file")
+            # Try to upload a test file; generation 0 means "only if absent", and
+            # the upload response carries the generation, so no metadata GET
+            # (unique name, so a blob left by an interrupted run can't block it)
+            blob = bucket.blob(f"test/setup_verification-{uuid.uuid4().hex}.txt")
+            blob.upload_from_string("Lumen GCP setup verified!", if_generation_match=0)
+            print("✅ Successfully uploaded test file", file=out)
             
-            # Clean up
-            blob.delete()
-            print("✅ Successfully deleted test file")
+            # Clean up exactly the object we wrote
+            blob.delete(if_generation_match=blob.generation)
+            print("✅ Successfully deleted test file", file=out)
             return True
         else:
-            print(f"❌ Bucket '{bucket_name}' not found")
+            print(f"❌ Bucket '{bucket_name}' not found", file=out)
             return False
             
     except Exception as e:
-        print(f"❌ Cloud Storage Error: {e}")
+        print(f"❌ Cloud Storage Error: {e}", file=out)
         return False
 
-def test_firebase():
-    """Test Firebase configuration"""
-    print(f"\n🔥 Testing Firebase configuration...")
+def test_firebase(out=None):
+    """Test Firebase configuration (report lines go to out, default stdout)"""
+    print(f"\n🔥 Testing Firebase configuration...", file=out)
     
     try:
         from app.firebase_config import firebase_config
         
         if firebase_config.app:
-            print("✅ Firebase Admin SDK initialized successfully")
+            print("✅ Firebase Admin SDK initialized successfully", file=out)
             
             # Test project ID
             project_id = os.getenv("FIREBASE_PROJECT_ID")
-            print(f"✅ Firebase project ID: {project_id}")
+            print(f"✅ Firebase project ID: {project_id}", file=out)
             return True
         else:
-            print("❌ Firebase not initialized")
+            print("❌ Firebase not initialized", file=out)
             return False
             
     except Exception as e:
-        print(f"❌ Firebase Error: {e}")
-        print("💡 Make sure firebase_service_account.json exists")
+        print(f"❌ Firebase Error: {e}", file=out)
+        print("💡 Make sure firebase_service_account.json exists", file=out)
         return False
 
-def test_environment_variables():
-    """Test environment variables"""
-    print(f"\n⚙️  Testing environment variables...")
+def test_environment_variables(out=None):
+    """Test environment variables (report lines go to out, default stdout)"""
+    print(f"\n⚙️  Testing environment variables...", file=out)
     
     required_vars = [
         "PROJECT_ID",
@@ -77,14 +90,12 @@ def test_environment_variables():
         "GOOGLE_APPLICATION_CREDENTIALS"
     ]
     
-    missing_vars = []
-    for var in required_vars:
-        value = os.getenv(var)
-        if value:
-            print(f"✅ {var}: {value}")
-        else:
-            print(f"❌ {var}: Missing")
-            missing_vars.append(var)
+    env = os.environ
+    missing_vars = [var for var in required_vars if not env.get(var)]
+    print("\n".join(
+        f"❌ {var}: Missing" if var in missing_vars else f"✅ {var}: {env[var]}"
+        for var in required_vars
+    ), file=out)
     
     return len(missing_vars) == 0
 
@@ -96,14 +107,18 @@ def test_gcp_setup():
     print(f"📋 Project ID: {project_id}")
     print("="*50)
     
-    # Test environment variables
-    env_ok = test_environment_variables()
-    
-    # Test Cloud Storage
-    storage_ok = test_cloud_storage()
-    
-    # Test Firebase
-    firebase_ok = test_firebase()
+    # Environment, Cloud Storage and Firebase checks run concurrently (the
+    # latter two wait on the network); each one writes to its own buffer,
+    # printed in order, so the report reads the same as a sequential run
+    checks = (test_environment_variables, test_cloud_storage, test_firebase)
+    buffers = [io.StringIO() for _ in checks]
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = [executor.submit(check, buffer) for check, buffer in zip(checks, buffers)]
+        results = []
+        for future, buffer in zip(futures, buffers):
+            results.append(future.result())
+            print(buffer.getvalue(), end="")
+    env_ok, storage_ok, firebase_ok = results
     
     # Summary
     print("\n" + "="*50)
@@ -13,7 +13,7 @@ from unittest.mock import Mock, MagicMock
 
 import httpx
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -25,7 +25,9 @@ from app.models.photo import Base as PhotoBase
 
 
 # Test Database Configuration
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+# In-memory: StaticPool below keeps the single connection (and so the
+# database) alive for the whole run, with no test.db file I/O.
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -38,6 +40,18 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+# pysqlite starts transactions lazily and breaks SAVEPOINT handling; let
+# SQLAlchemy emit BEGIN itself so db_session can roll back nested commits.
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _begin_sqlite_transaction(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Create an instance of the default event loop for the test session."""
@@ -46,23 +60,31 @@ def event_loop():
     loop.close()
 
 
-@pytest.fixture
-def db_session():
-    """Create a fresh database session for each test."""
-    # Create all tables
+@pytest.fixture(scope="session")
+def db_tables():
+    """Create all tables once for the test session."""
     UserBase.metadata.create_all(bind=engine)
     PhotoBase.metadata.create_all(bind=engine)
-    
-    # Create session
-    session = TestingSessionLocal()
+    yield
+    UserBase.metadata.drop_all(bind=engine)
+    PhotoBase.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def db_session(db_tables):
+    """Create a database session whose changes are rolled back after each test."""
+    connection = engine.connect()
+    transaction = connection.begin()
+    # Commits inside the test only release a SAVEPOINT; the outer
+    # transaction is rolled back at teardown.
+    session = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
     
     try:
         yield session
     finally:
         session.close()
-        # Drop all tables after test
-        UserBase.metadata.drop_all(bind=engine)
-        PhotoBase.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
 
 
 @pytest.fixture
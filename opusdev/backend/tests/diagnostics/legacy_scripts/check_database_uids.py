@@ -12,9 +12,15 @@ sys.path.append('../../..')  # Updated path for new location
 from app.database.connection import SessionLocal
 from app.models.photo import Photo
 from app.models.user import User
-from sqlalchemy.orm import joinedload
 from google.cloud import storage
-import re
+
+HEX_DIGITS = '0123456789abcdef'
+
+def is_uuid_string(value):
+    """Lowercase 8-4-4-4-12 UUID check, done with C-level str methods instead of a regex"""
+    hex_part = value.replace('-', '')
+    return (len(value) == 36 and value[8] == value[13] == value[18] == value[23] == '-'
+            and len(hex_part) == 32 and not hex_part.strip(HEX_DIGITS))
 
 def check_database_uids():
     """Check what Firebase UIDs are stored in database"""
@@ -22,12 +28,12 @@ def check_database_uids():
     
     db = SessionLocal()
     try:
-        # Check user UIDs
-        users = db.query(User).limit(5).all()
+        # Check user UIDs (only the printed columns; no ORM objects needed)
+        users = db.query(User.id, User.display_name).limit(5).all()
         print(f"\n--- USERS TABLE ({len(users)} samples) ---")
         for user in users:
             uid_str = str(user.id)
-            is_uuid = bool(re.match(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', uid_str))
+            is_uuid = is_uuid_string(uid_str)
             print(f"ID: {uid_str[:20]}{'...' if len(uid_str) > 20 else ''}")
             print(f"  Length: {len(uid_str)}")
             print(f"  Format: {'UUID' if is_uuid else 'OTHER'}")
@@ -35,11 +41,11 @@ def check_database_uids():
             print()
         
         # Check photo user_ids
-        photos = db.query(Photo).options(joinedload(Photo.user)).limit(5).all()
+        photos = db.query(Photo.id, Photo.user_id, Photo.title).limit(5).all()
         print(f"--- PHOTOS TABLE ({len(photos)} samples) ---")
         for photo in photos:
             uid_str = str(photo.user_id)
-            is_uuid = bool(re.match(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', uid_str))
+            is_uuid = is_uuid_string(uid_str)
             print(f"Photo ID: {photo.id}")
             print(f"User ID: {uid_str[:20]}{'...' if len(uid_str) > 20 else ''}")
             print(f"  Length: {len(uid_str)}")
@@ -63,7 +69,10 @@ def check_gcs_file_paths():
         print(f"\nBucket: {bucket_name}")
         
         # List some files in photos/ directory
-        photo_blobs = list(bucket.list_blobs(prefix='photos/', max_results=10))
+        # Only names are used, so ask the API for nothing else
+        photo_blobs = list(bucket.list_blobs(
+            prefix='photos/', max_results=10, fields='items(name),nextPageToken'
+        ))
         
         print(f"\n--- ACTUAL GCS FILE PATHS ({len(photo_blobs)} samples) ---")
         for blob in photo_blobs:
@@ -73,7 +82,7 @@ def check_gcs_file_paths():
                 uid_part = path_parts[1]  # Firebase UID
                 filename = path_parts[2]  # photo file
                 
-                is_uuid = bool(re.match(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', uid_part))
+                is_uuid = is_uuid_string(uid_part)
                 
                 print(f"Path: {blob.name}")
                 print(f"  UID part: {uid_part[:20]}{'...' if len(uid_part) > 20 else ''}")
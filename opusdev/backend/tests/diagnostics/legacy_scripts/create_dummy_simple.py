@@ -9,6 +9,8 @@ import os
 import sys
 import uuid
 import random
+import secrets
+import string
 import asyncio
 from pathlib import Path
 from datetime import datetime
@@ -29,19 +31,38 @@ from app.models.photo import Photo
 cred = credentials.Certificate('../../../firebase_service_account.json')
 firebase_admin.initialize_app(cred)
 
-def create_firebase_user(email, display_name):
-    """Create a Firebase user"""
-    try:
-        user_record = auth.create_user(
-            email=email,
-            display_name=display_name,
+FIREBASE_UID_ALPHABET = string.ascii_letters + string.digits
+
+def new_firebase_uid():
+    """Random 28-character alphanumeric UID, the format Firebase generates"""
+    return ''.join(secrets.choice(FIREBASE_UID_ALPHABET) for _ in range(28))
+
+def import_firebase_users(photographers):
+    """Create all Firebase users in one import_users call; returns {index: uid} for those created"""
+    records = [
+        auth.ImportUserRecord(
+            uid=new_firebase_uid(),
+            email=photographer['email'],
+            display_name=photographer['name'],
             email_verified=True
         )
-        print(f"✅ Created Firebase user: {display_name} ({user_record.uid})")
-        return user_record.uid
+        for photographer in photographers
+    ]
+    try:
+        result = auth.import_users(records)
     except Exception as e:
-        print(f"❌ Failed to create Firebase user {display_name}: {e}")
-        return None
+        print(f"❌ Failed to import Firebase users: {e}")
+        return {}
+    
+    failed = {error.index: error.reason for error in result.errors}
+    created = {}
+    for index, (photographer, record) in enumerate(zip(photographers, records)):
+        if index in failed:
+            print(f"❌ Failed to create Firebase user {photographer['name']}: {failed[index]}")
+        else:
+            print(f"✅ Created Firebase user: {photographer['name']} ({record.uid})")
+            created[index] = record.uid
+    return created
 
 def create_dummy_photographers():
     """Create dummy photographers with direct database access"""
@@ -83,11 +104,15 @@ def create_dummy_photographers():
     
     db = SessionLocal()
     success_count = 0
+    new_users = []
+    created_names = []  # printed after commit, when the User objects are expired
     
     try:
-        for photographer in photographers:
-            # Create Firebase user
-            firebase_uid = create_firebase_user(photographer['email'], photographer['name'])
+        # Create all Firebase users in one request
+        firebase_uids = import_firebase_users(photographers)
+        
+        for index, photographer in enumerate(photographers):
+            firebase_uid = firebase_uids.get(index)
             if not firebase_uid:
                 continue
             
@@ -113,12 +138,16 @@ def create_dummy_photographers():
                 created_at=datetime.utcnow(),
                 updated_at=datetime.utcnow()
             )
-            
-            db.add(new_user)
-            db.commit()
-            
-            print(f"✅ Created photographer: {photographer['name']}")
-            success_count += 1
+            new_users.append(new_user)
+            created_names.append(photographer['name'])
+        
+        # One INSERT batch and one commit for all photographers
+        db.add_all(new_users)
+        db.commit()
+        
+        for name in created_names:
+            print(f"✅ Created photographer: {name}")
+        success_count = len(created_names)
             
     except Exception as e:
         print(f"❌ Error creating photographers: {e}")
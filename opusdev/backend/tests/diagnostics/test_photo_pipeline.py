@@ -90,7 +90,7 @@ class TestPhotoDisplayPipeline:
         except Exception as e:
             pytest.fail(f"PhotoService initialization failed: {e}")
     
-    @patch('app.services.photo_service.storage.Client')
+    @patch('app.services.storage_client.storage.Client')
     def test_signed_url_generation(self, mock_storage_client):
         """Test GCS signed URL generation with ID validation"""
         # Setup mocks
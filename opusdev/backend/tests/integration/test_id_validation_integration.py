@@ -120,7 +120,7 @@ class TestPhotoServiceIDValidation:
             is_portfolio=False
         )
     
-    @patch('app.services.photo_service.storage.Client')
+    @patch('app.services.storage_client.storage.Client')
     def test_photo_service_with_valid_ids(self, mock_storage_client, db_session, mock_firebase_user, sample_photo_request):
         """Test PhotoService operations with valid IDs"""
         # Mock storage operations
@@ -145,7 +145,7 @@ class TestPhotoServiceIDValidation:
         assert "placeholder" in image_url  # Mock returns placeholder
         assert "placeholder" in thumbnail_url
     
-    @patch('app.services.photo_service.storage.Client')
+    @patch('app.services.storage_client.storage.Client')
     def test_photo_service_with_invalid_firebase_uid(self, mock_storage_client, db_session, sample_photo_request):
         """Test PhotoService rejects invalid Firebase UID"""
         photo_service = PhotoService(db=db_session)
@@ -157,7 +157,7 @@ class TestPhotoServiceIDValidation:
         with pytest.raises(IDValidationError):
             photo_service._generate_photo_urls(test_photo_id, invalid_firebase_uid)
     
-    @patch('app.services.photo_service.storage.Client')
+    @patch('app.services.storage_client.storage.Client')
     def test_photo_service_with_invalid_photo_id(self, mock_storage_client, db_session, mock_firebase_user):
         """Test PhotoService rejects invalid photo ID"""
         photo_service = PhotoService(db=db_session)
@@ -169,7 +169,7 @@ class TestPhotoServiceIDValidation:
         with pytest.raises(IDValidationError):
             photo_service._generate_photo_urls(invalid_photo_id, valid_firebase_uid)
     
-    @patch('app.services.photo_service.storage.Client')
+    @patch('app.services.storage_client.storage.Client')
     def test_ensure_user_exists_with_valid_uid(self, mock_storage_client, db_session, mock_firebase_user):
         """Test that ensure_user_exists works with valid Firebase UID"""
         photo_service = PhotoService(db=db_session)
@@ -191,7 +191,7 @@ class TestPhotoServiceIDValidation:
         assert user_record[0] == mock_firebase_user.uid  # id column
         assert user_record[1] == mock_firebase_user.email  # email column
     
-    @patch('app.services.photo_service.storage.Client')
+    @patch('app.services.storage_client.storage.Client')
     def test_ensure_user_exists_with_invalid_uid(self, mock_storage_client, db_session, mock_invalid_firebase_user):
         """Test that ensure_user_exists rejects invalid Firebase UID"""
         photo_service = PhotoService(db=db_session)
@@ -306,7 +306,7 @@ class TestEndToEndPhotoFlow:
         user.name = "Integration Test User"
         return user
     
-    @patch('app.services.photo_service.storage.Client')
+    @patch('app.services.storage_client.storage.Client')
     @patch('app.auth_middleware.get_current_user')
     def test_complete_photo_upload_flow(self, mock_get_user, mock_storage_client, 
                                        client, db_session, mock_complete_firebase_user):
@@ -366,7 +366,7 @@ class TestEndToEndPhotoFlow:
         assert photo_record[1] == mock_complete_firebase_user.uid  # User ID is Firebase UID
         assert photo_record[2] == "Integration Test Photo"  # Title matches
     
-    @patch('app.services.photo_service.storage.Client')
+    @patch('app.services.storage_client.storage.Client')
     def test_photo_retrieval_with_id_validation(self, mock_storage_client, db_session):
         """Test photo retrieval with validated IDs"""
         # Setup storage mock
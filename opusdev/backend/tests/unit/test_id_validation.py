@@ -0,0 +1,184 @@
+"""
+Unit tests for ID validation utilities.
+
+Tests Firebase UID and UUID validation, including the memoized parsing
+behind validate_firebase_uid and validate_uuid.
+"""
+
+import logging
+import pickle
+import pytest
+import uuid
+from unittest.mock import patch
+
+from app.utils import id_validation
+from app.utils import IDValidationError, validate_firebase_uid, validate_uuid
+
+
+FIREBASE_UID = "9pGzwsVBRMaSxMOZ6QNTJJjnl1b2"
+
+
+@pytest.mark.unit
+class TestValidationCache:
+    """Test memoized ID parsing."""
+
+    def setup_method(self):
+        """Start every test with empty caches"""
+        id_validation._parse_firebase_uid.cache_clear()
+        id_validation._parse_uuid_string.cache_clear()
+
+    def test_repeated_uid_is_parsed_once(self):
+        """Test validating the same UID twice hits the cache."""
+        assert validate_firebase_uid(FIREBASE_UID) == FIREBASE_UID
+        assert validate_firebase_uid(FIREBASE_UID, context="again") == FIREBASE_UID
+
+        info = id_validation._parse_firebase_uid.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_uuid_string_returns_same_object(self):
+        """Test cached UUID strings convert to equal UUID objects."""
+        photo_id = uuid.uuid4()
+
+        assert validate_uuid(str(photo_id)) == photo_id
+        assert validate_uuid(str(photo_id)) == photo_id
+        assert id_validation._parse_uuid_string.cache_info().hits == 1
+
+    def test_uuid_object_passes_through(self):
+        """Test UUID objects are returned unchanged without parsing."""
+        photo_id = uuid.uuid4()
+
+        assert validate_uuid(photo_id) is photo_id
+        assert id_validation._parse_uuid_string.cache_info().misses == 0
+
+    @pytest.mark.parametrize("value", ["short", FIREBASE_UID[:-1] + "!", "", None, 12345])
+    def test_invalid_uid_still_raises_when_cached(self, value):
+        """Test invalid UIDs raise on every call, not just the first."""
+        for _ in range(2):
+            with pytest.raises(IDValidationError):
+                validate_firebase_uid(value, context="test")
+
+    @pytest.mark.parametrize("value", ["not-a-uuid", FIREBASE_UID, "", None, 12345])
+    def test_invalid_uuid_still_raises_when_cached(self, value):
+        """Test invalid UUIDs raise on every call, not just the first."""
+        for _ in range(2):
+            with pytest.raises(IDValidationError):
+                validate_uuid(value, context="test")
+
+
+@pytest.mark.unit
+class TestDetectIdType:
+    """Test ID type detection."""
+
+    @pytest.mark.parametrize("value,expected", [
+        (FIREBASE_UID, id_validation.IDType.FIREBASE_UID),
+        ("12345678-1234-4234-8234-123456789abc", id_validation.IDType.UUID_STRING),
+        ("12345678-1234-4234-8234-123456789ABC", id_validation.IDType.UUID_STRING),
+        (uuid.uuid4(), id_validation.IDType.UUID_OBJECT),
+        (FIREBASE_UID[:-1], id_validation.IDType.UNKNOWN),
+        (FIREBASE_UID + "a", id_validation.IDType.UNKNOWN),
+        (FIREBASE_UID[:-1] + "é", id_validation.IDType.UNKNOWN),
+        (FIREBASE_UID[:-1] + "_", id_validation.IDType.UNKNOWN),
+        ("12345678-1234-1234-8234-123456789abc", id_validation.IDType.UNKNOWN),
+        ("", id_validation.IDType.UNKNOWN),
+        (None, id_validation.IDType.UNKNOWN),
+        (12345, id_validation.IDType.UNKNOWN),
+    ])
+    def test_detects_by_length_and_format(self, value, expected):
+        """Test each value is classified by its length and character set."""
+        assert id_validation.detect_id_type(value) == expected
+
+    def test_repeated_string_detection_is_cached(self):
+        """Test detecting the same string twice hits the cache."""
+        id_validation._detect_id_type_str.cache_clear()
+
+        for _ in range(3):
+            assert id_validation.detect_id_type(FIREBASE_UID) == id_validation.IDType.FIREBASE_UID
+
+        info = id_validation._detect_id_type_str.cache_info()
+        assert info.misses == 1
+        assert info.hits == 2
+
+
+@pytest.mark.unit
+class TestDebugLogging:
+    """Test debug logging is skipped when DEBUG is disabled."""
+
+    def test_log_id_context_skips_detection_when_disabled(self):
+        """Test log_id_context does no work unless DEBUG is enabled."""
+        with patch.object(id_validation.logger, "isEnabledFor", return_value=False), \
+             patch.object(id_validation, "detect_id_type") as detect:
+            id_validation.log_id_context("test", user_id=FIREBASE_UID)
+
+        detect.assert_not_called()
+
+    def test_log_id_context_logs_when_enabled(self, caplog):
+        """Test log_id_context still reports IDs and types at DEBUG."""
+        with caplog.at_level(logging.DEBUG, logger=id_validation.logger.name):
+            id_validation.log_id_context("test", user_id=FIREBASE_UID)
+
+        assert f"user_id={FIREBASE_UID}" in caplog.text
+        assert "detected=firebase_uid" in caplog.text
+
+
+@pytest.mark.unit
+class TestFormatGcsPath:
+    """Test GCS path construction."""
+
+    def test_three_part_path(self):
+        """Test the common prefix/uid/filename shape."""
+        photo_id = uuid.uuid4()
+        path = id_validation.format_gcs_path("photos", FIREBASE_UID, f"{photo_id}.jpg")
+
+        assert path == f"photos/{FIREBASE_UID}/{photo_id}.jpg"
+        assert path == id_validation.fast_gcs_path("photos", FIREBASE_UID, f"{photo_id}.jpg")
+
+    def test_other_arities_are_joined(self):
+        """Test paths with other part counts are still joined with slashes."""
+        photo_id = uuid.uuid4()
+
+        assert id_validation.format_gcs_path("photos", FIREBASE_UID) == f"photos/{FIREBASE_UID}"
+        assert id_validation.format_gcs_path("a", FIREBASE_UID, photo_id, "b.jpg") == f"a/{FIREBASE_UID}/{photo_id}/b.jpg"
+
+    def test_rejects_none_part(self):
+        """Test None components raise instead of producing 'None' in the path."""
+        with pytest.raises(IDValidationError):
+            id_validation.format_gcs_path("photos", None, "x.jpg")
+
+
+@pytest.mark.unit
+class TestIDValidationError:
+    """Test the validation error message and round-tripping."""
+
+    def test_message_format(self):
+        """Test str() reports the value, its type and the expected ID type."""
+        error = IDValidationError("Invalid Firebase UID in test", 123, id_validation.IDType.FIREBASE_UID)
+
+        assert str(error) == "Invalid Firebase UID in test. Got: '123' (type: int), expected: firebase_uid"
+
+    def test_pickle_roundtrip(self):
+        """Test the exception survives pickling with its attributes."""
+        error = IDValidationError("Invalid UUID", "bad", id_validation.IDType.UUID_OBJECT)
+        restored = pickle.loads(pickle.dumps(error))
+
+        assert str(restored) == str(error)
+        assert restored.expected_type is id_validation.IDType.UUID_OBJECT
+
+
+@pytest.mark.unit
+class TestEnsureStringFormat:
+    """Test conversion of path components to strings."""
+
+    def test_converts_ids_and_plain_values(self):
+        """Test IDs, strings and ints convert; UUID objects become canonical strings."""
+        photo_id = uuid.uuid4()
+
+        assert id_validation.ensure_string_format(FIREBASE_UID, photo_id, "x.jpg", 7) == (
+            FIREBASE_UID, str(photo_id), "x.jpg", "7"
+        )
+
+    @pytest.mark.parametrize("value", [None, 1.5, object()])
+    def test_rejects_unconvertible_values(self, value):
+        """Test None and non-string, non-numeric values raise."""
+        with pytest.raises(IDValidationError, match="at position 1.* in test"):
+            id_validation.ensure_string_format(FIREBASE_UID, value, context="test")
@@ -0,0 +1,164 @@
+"""
+Unit tests for PhotoService helpers.
+
+Tests the module-level signed URL cache and other pure helpers that
+don't need a database or a real Cloud Storage bucket.
+"""
+
+import base64
+import hashlib
+import hmac
+import io
+import pytest
+import uuid
+from unittest.mock import patch
+from PIL import Image
+
+from app.services import photo_service
+from app.services.photo_service import (
+    get_cached_photo_urls, cache_photo_urls, invalidate_photo_urls
+)
+
+
+FIREBASE_UID = "9pGzwsVBRMaSxMOZ6QNTJJjnl1b2"
+
+
+@pytest.mark.unit
+class TestSignedUrlCache:
+    """Test the in-process signed URL cache."""
+
+    def setup_method(self):
+        """Start every test with an empty cache"""
+        photo_service._signed_url_cache.clear()
+
+    def test_cache_roundtrip(self):
+        """Test cached URLs are returned for the same photo and user."""
+        photo_id = uuid.uuid4()
+        cache_photo_urls(photo_id, FIREBASE_UID, "https://img", "https://thumb")
+
+        assert get_cached_photo_urls(photo_id, FIREBASE_UID) == ("https://img", "https://thumb")
+        # UUID objects and strings share the same cache entry
+        assert get_cached_photo_urls(str(photo_id), FIREBASE_UID) == ("https://img", "https://thumb")
+
+    def test_cache_miss(self):
+        """Test unknown photos are not served from cache."""
+        assert get_cached_photo_urls(uuid.uuid4(), FIREBASE_UID) is None
+
+    def test_cache_expiry(self):
+        """Test entries stop being served once their TTL has passed."""
+        photo_id = uuid.uuid4()
+        with patch.object(photo_service.time, "monotonic", return_value=1000.0):
+            cache_photo_urls(photo_id, FIREBASE_UID, "https://img", "https://thumb")
+
+        expired_at = 1000.0 + photo_service.SIGNED_URL_CACHE_TTL
+        with patch.object(photo_service.time, "monotonic", return_value=expired_at):
+            assert get_cached_photo_urls(photo_id, FIREBASE_UID) is None
+
+    def test_invalidate(self):
+        """Test invalidation removes the cached URLs."""
+        photo_id = uuid.uuid4()
+        cache_photo_urls(photo_id, FIREBASE_UID, "https://img", "https://thumb")
+        invalidate_photo_urls(photo_id, FIREBASE_UID)
+
+        assert get_cached_photo_urls(photo_id, FIREBASE_UID) is None
+
+    def test_cache_size_is_bounded(self):
+        """Test the cache never grows past its configured size."""
+        with patch.object(photo_service, "SIGNED_URL_CACHE_MAX_ENTRIES", 3):
+            for _ in range(10):
+                cache_photo_urls(uuid.uuid4(), FIREBASE_UID, "https://img", "https://thumb")
+
+            assert len(photo_service._signed_url_cache) <= 3
+
+    def test_full_cache_evicts_oldest_first(self):
+        """Test a full cache drops its oldest entries and keeps recent ones."""
+        photo_ids = [uuid.uuid4() for _ in range(5)]
+        with patch.object(photo_service, "SIGNED_URL_CACHE_MAX_ENTRIES", 3):
+            for photo_id in photo_ids:
+                cache_photo_urls(photo_id, FIREBASE_UID, "https://img", "https://thumb")
+
+        assert get_cached_photo_urls(photo_ids[0], FIREBASE_UID) is None
+        assert get_cached_photo_urls(photo_ids[1], FIREBASE_UID) is None
+        for photo_id in photo_ids[2:]:
+            assert get_cached_photo_urls(photo_id, FIREBASE_UID) is not None
+
+
+@pytest.mark.unit
+class TestCdnCookie:
+    """Test Cloud CDN signed cookie generation."""
+
+    def test_cookie_requires_configuration(self):
+        """Test cookies are refused when CDN delivery is not configured."""
+        with patch.object(photo_service, "PHOTO_CDN_BASE_URL", ""):
+            with pytest.raises(ValueError):
+                photo_service.issue_cdn_cookie(FIREBASE_UID)
+
+    def test_cookie_policy_and_signature(self):
+        """Test the cookie carries the user's URL prefix, key name and a valid signature."""
+        key = base64.urlsafe_b64encode(b"0123456789abcdef").decode()
+        with patch.object(photo_service, "PHOTO_CDN_BASE_URL", "https://cdn.example.com"), \
+             patch.object(photo_service, "CDN_SIGNING_KEY_NAME", "test-key"), \
+             patch.object(photo_service, "CDN_SIGNING_KEY", key):
+            cookie, max_age = photo_service.issue_cdn_cookie(FIREBASE_UID)
+
+        policy, signature = cookie.rsplit(":Signature=", 1)
+        prefix = base64.urlsafe_b64encode(f"https://cdn.example.com/photos/{FIREBASE_UID}/".encode()).decode()
+        assert policy.startswith(f"URLPrefix={prefix}:Expires=")
+        assert policy.endswith(":KeyName=test-key")
+        assert max_age == int(photo_service.CDN_COOKIE_LIFETIME.total_seconds())
+
+        expected = hmac.new(b"0123456789abcdef", policy.encode(), hashlib.sha1).digest()
+        assert base64.urlsafe_b64decode(signature) == expected
+
+    def test_only_owner_originals_use_cdn_urls(self):
+        """Test other viewers and thumbnails keep signed URLs when the CDN is on."""
+        photo_service._signed_url_cache.clear()
+        service = photo_service.PhotoService.__new__(photo_service.PhotoService)
+        service.bucket_name = "bucket"
+        photo_id = uuid.uuid4()
+
+        with patch.object(photo_service, "PHOTO_CDN_BASE_URL", "https://cdn.example.com"), \
+             patch.object(photo_service, "sign_gcs_path", side_effect=lambda bucket, path: f"signed:{path}"):
+            owner_image, owner_thumb = service._generate_photo_urls(photo_id, FIREBASE_UID, owner_view=True)
+            viewer_image, viewer_thumb = service._generate_photo_urls(photo_id, FIREBASE_UID)
+
+        assert owner_image == f"https://cdn.example.com/photos/{FIREBASE_UID}/{photo_id}.jpg"
+        assert owner_thumb == f"signed:thumbnails/{FIREBASE_UID}/{photo_id}_thumb.jpg"
+        assert viewer_image == f"signed:photos/{FIREBASE_UID}/{photo_id}.jpg"
+        assert viewer_thumb == owner_thumb
+
+
+def _jpeg_bytes(size=(64, 48)) -> bytes:
+    """Encode a small solid-colour JPEG"""
+    output = io.BytesIO()
+    Image.new('RGB', size, (200, 100, 50)).save(output, format='JPEG')
+    return output.getvalue()
+
+
+@pytest.mark.unit
+class TestCheckImageUpload:
+    """Test upload size and header checks."""
+
+    def test_accepts_small_image_and_rewinds(self):
+        """Test a valid image passes and the file is left at the start."""
+        file_obj = io.BytesIO(_jpeg_bytes())
+        photo_service.check_image_upload(file_obj)
+
+        assert file_obj.tell() == 0
+
+    def test_rejects_oversize_file(self):
+        """Test files over MAX_UPLOAD_BYTES are rejected before parsing."""
+        with patch.object(photo_service, "MAX_UPLOAD_BYTES", 10):
+            with pytest.raises(ValueError, match="larger than"):
+                photo_service.check_image_upload(io.BytesIO(_jpeg_bytes()))
+
+    def test_rejects_non_image(self):
+        """Test non-image bytes are rejected."""
+        with pytest.raises(ValueError, match="Not a readable image"):
+            photo_service.check_image_upload(io.BytesIO(b"definitely not an image"))
+
+    def test_rejects_too_many_pixels(self):
+        """Test images over the pixel limit are rejected from the header."""
+        with patch.object(photo_service, "MAX_IMAGE_PIXELS", 100):
+            with pytest.raises(ValueError, match="MP limit"):
+                photo_service.check_image_upload(io.BytesIO(_jpeg_bytes((64, 48))))